@@ -6,13 +6,22 @@ USO:
     python scripts/dashboard_bot15min.py
 """
 
+import bisect
+import heapq
 import json
 import os
+import re
+import shutil
 import sys
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, TypedDict
 
 # Carregar .env (mesmo que o bot) para POLYMARKET_PRIVATE_KEY / POLYMARKET_FUNDER
 try:
@@ -26,13 +35,47 @@ try:
 except ImportError:
     httpx = None
 
+# HTTP/2 (extra httpx[http2]): as requisições paralelas à CLOB multiplexam numa só conexão TLS
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# msgspec: decodifica a resposta de preço da CLOB direto num Struct tipado (sem dict intermediário)
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# inotify (Linux): acordar assim que o bot escrever no log, em vez de só no próximo tick
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# orjson (C) é bem mais rápido que json da stdlib para o log JSONL e respostas da API
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 LOG_DIR = Path(__file__).parent.parent / "logs"
 GAMMA_HOST = os.getenv("GAMMA_BASE_URL", "https://gamma-api.polymarket.com")
 CLOB_HOST = os.getenv("CLOB_BASE_URL", "https://clob.polymarket.com")
 ASSETS = ["btc", "eth", "sol", "xrp"]
 ENTRY_WINDOW_START = 240   # 4 min antes da expiração
 ENTRY_WINDOW_END = 60      # 1 min antes (hard stop)
-WINDOW_SECONDS = 900        # 1 ciclo = 15 min (atualizar saldo por ciclo)
+WINDOW_SECONDS = 900        # 1 ciclo = 15 min
+PRICE_REFRESH_ENTRY_SECONDS = 2   # preços CLOB na janela de entrada (thread de fundo)
+PRICE_REFRESH_NEAR_SECONDS = 10   # último minuto antes da janela de entrada
+PRICE_REFRESH_IDLE_SECONDS = 30   # fora da janela de entrada o bot não opera: menos carga na API
+NEAR_ENTRY_SECONDS = 300          # "perto da janela": time_to_expiry < 5 min
+PRICE_CACHE_MAX_AGE = 60          # longe da janela de entrada, reaproveita preços com até 60s
+RENDER_SECONDS = 1          # redesenho da tela (contagem regressiva)
+BALANCE_REFRESH_SECONDS = 60      # saldo (data-api + balanceOf on-chain): cadência própria, fora da dos preços
+PRICE_ERROR_RETRY_SECONDS = 5     # busca de preços/saldo falhou: nova tentativa (mantém os últimos dados)
 
 # ─── Cores ANSI ──────────────────────────────────────────────────────────────
 
@@ -64,6 +107,10 @@ if os.name == "nt":
     except Exception:
         pass
 
+# Cursor para o topo + apagar tela (evita fork/exec de `clear` a cada atualização)
+CLEAR_SCREEN = "\033[H\033[2J"
+_ANSI_RE = re.compile(r"\033\[[0-9;]*m")
+
 NO_COLOR = os.getenv("NO_COLOR")  # Padrão https://no-color.org/
 if NO_COLOR:
     for attr in dir(C):
@@ -74,6 +121,12 @@ if NO_COLOR:
 # ─── Preços CLOB ao vivo ─────────────────────────────────────────────────────
 
 def _to_float(v) -> float | None:
+    # Fast path: no log/API quase sempre já vem float/int (sem custo de try/except)
+    t = type(v)
+    if t is float:
+        return v
+    if t is int:
+        return float(v)
     if v is None:
         return None
     try:
@@ -82,35 +135,88 @@ def _to_float(v) -> float | None:
         return None
 
 
+_CLOB_ENDPOINTS = (("/midpoint", "mid"), ("/price", "price"))
+
+if msgspec is not None:
+    class _ClobPrice(msgspec.Struct):
+        """Payload de /midpoint ({"mid": "0.95"}) ou /price ({"price": "0.95"})."""
+        mid: float | None = None
+        price: float | None = None
+        value: float | None = None
+
+    # strict=False aceita os números como string, que é como a CLOB os envia
+    _CLOB_PRICE_DECODER = msgspec.json.Decoder(_ClobPrice, strict=False)
+else:
+    _CLOB_PRICE_DECODER = None
+
+
+def _parse_clob_price(content: bytes, key: str) -> float | None:
+    """Preço em [0, 1] do campo key (ou "value") da resposta, senão None."""
+    if _CLOB_PRICE_DECODER is not None:
+        m = _CLOB_PRICE_DECODER.decode(content)
+        val = getattr(m, key)
+        if val is None:  # 0.0 é preço válido: só cai para "value" se o campo faltar
+            val = m.value
+    else:
+        data = _loads(content)
+        val = _to_float(data.get(key))
+        if val is None:
+            val = _to_float(data.get("value"))
+    if val is not None and 0 <= val <= 1:
+        return val
+    return None
+
+
+# token_id -> (endpoint que respondeu por último, window_ts). Tenta esse primeiro no próximo tick.
+_CLOB_PREF: dict[str, tuple[str, int]] = {}
+
+
 def _clob_price(c, token_id: str) -> float | None:
-    """Preço ao vivo: /midpoint, fallback /price."""
+    """Preço ao vivo: /midpoint, fallback /price (começa pelo último que funcionou p/ o token)."""
     base = CLOB_HOST.rstrip("/")
-    for path, key in [("/midpoint", "mid"), ("/price", "price")]:
+    endpoints = _CLOB_ENDPOINTS
+    pref = _CLOB_PREF.get(token_id)
+    if pref is not None and pref[0] != endpoints[0][0]:
+        endpoints = endpoints[::-1]
+    for path, key in endpoints:
         try:
             r = c.get(base + path, params={"token_id": token_id})
             if r.status_code == 200:
-                data = r.json()
-                p = data.get(key) or data.get("value")
-                if p is not None:
-                    val = _to_float(p)
-                    if val is not None and 0 <= val <= 1:
-                        return val
+                val = _parse_clob_price(r.content, key)
+                if val is not None:
+                    _CLOB_PREF[token_id] = (path, (int(time.time()) // WINDOW_SECONDS) * WINDOW_SECONDS)
+                    return val
         except Exception:
             continue
     return None
 
 
+_book_price_key = "price"  # campo do preço nos níveis do /book ("price"; formato curto usa "p")
+
+
+def _level_price(level: dict) -> float | None:
+    """Preço de um nível do book, lendo primeiro o campo que funcionou da última vez."""
+    global _book_price_key
+    p = level.get(_book_price_key)
+    if p is None:
+        alt = "p" if _book_price_key == "price" else "price"
+        p = level.get(alt)
+        if p is not None:
+            _book_price_key = alt
+    return _to_float(p)
+
+
 def _book_spread(c, token_id: str) -> tuple:
     """Retorna (mid, spread) do orderbook."""
     try:
         r = c.get(f"{CLOB_HOST}/book", params={"token_id": token_id})
         if r.status_code != 200:
             return None, None
-        book = r.json()
+        book = _loads(r.content)
         bids = book.get("bids", [])
         asks = book.get("asks", [])
-        best_bid = _to_float(bids[0].get("price") or bids[0].get("p")) if bids else None
-        best_ask = _to_float(asks[0].get("price") or asks[0].get("p")) if asks else None
+        best_bid = _level_price(bids[0]) if bids else None
+        best_ask = _level_price(asks[0]) if asks else None
         mid = None
         spread = None
         if best_bid is not None and best_ask is not None:
@@ -125,63 +231,159 @@ def _book_spread(c, token_id: str) -> tuple:
         return None, None
 
 
-def fetch_live_prices() -> dict:
-    """Preço % atual (YES mid, NO mid, YES spread) ao vivo por ativo."""
+# (window_ts, asset) -> (yes_token, no_token). Os tokens de um mercado não mudam
+# dentro da janela de 15 min, então a Gamma só é consultada quando a janela vira.
+_TOKENS_CACHE: dict[tuple[int, str], tuple[str, str]] = {}
+
+
+def _market_tokens(c, asset: str, wts: int) -> tuple[str, str] | None:
+    """(yes_token, no_token) do mercado asset/janela, com cache por janela."""
+    key = (wts, asset)
+    cached = _TOKENS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    slug = f"{asset}-updown-15m-{wts}"
+    r = c.get(f"{GAMMA_HOST}/events/slug/{slug}")
+    if r.status_code != 200:
+        return None
+    event = _loads(r.content)
+    markets = event.get("markets", [])
+    if not markets:
+        return None
+    raw = markets[0].get("clobTokenIds")
+    tokens = _loads(raw) if isinstance(raw, str) else (raw or [])
+    if len(tokens) < 2:
+        return None
+    _TOKENS_CACHE[key] = (tokens[0], tokens[1])
+    return _TOKENS_CACHE[key]
+
+
+def _prune_caches(window_ts: int) -> None:
+    """Remove tokens/preferências de janelas que não são mais consultadas (atual e anterior)."""
+    for key in [k for k in _TOKENS_CACHE if k[0] < window_ts - 900]:
+        _TOKENS_CACHE.pop(key, None)
+    for token_id in [t for t, (_, wts) in _CLOB_PREF.items() if wts < window_ts - 900]:
+        _CLOB_PREF.pop(token_id, None)
+
+
+# Chamadas CLOB de cada ativo (pool separado do _price_pool: as tarefas por ativo esperam por estas)
+_clob_pool = ThreadPoolExecutor(max_workers=3 * len(ASSETS), thread_name_prefix="clob")
+
+
+def _fetch_asset_prices(c, asset: str, window_ts: int, book_fallback: bool = True) -> dict:
+    """Preço YES/NO e spread de um ativo (janela atual, fallback janela anterior).
+
+    Se /midpoint e /price falham, o YES usa o mid do book YES (sempre buscado, para o
+    spread). book_fallback=False só evita o GET /book extra do NO (preço NO fica None).
+    """
+    for wts in [window_ts, window_ts - 900]:
+        tokens = _market_tokens(c, asset, wts)
+        if tokens is None:
+            continue
+        yes_token, no_token = tokens
+        # YES, NO e book YES em paralelo (3 RTTs viram 1)
+        yes_f = _clob_pool.submit(_clob_price, c, yes_token)
+        no_f = _clob_pool.submit(_clob_price, c, no_token)
+        book_f = _clob_pool.submit(_book_spread, c, yes_token)
+        yes_p, no_p = yes_f.result(), no_f.result()
+        yes_mid, spread = book_f.result()
+        if yes_p is None:
+            yes_p = yes_mid  # mid do book YES já buscado acima (sem 2º GET /book)
+        if no_p is None and book_fallback:
+            mid, _ = _book_spread(c, no_token)
+            if mid is not None:
+                no_p = mid
+        return {"yes": yes_p, "no": no_p, "spread": spread}  # Encontrou mercado ativo
+    return {"yes": None, "no": None, "spread": None}
+
+
+_http: "httpx.Client | None" = None
+
+
+def http_client() -> "httpx.Client":
+    """Client HTTP único do dashboard (Gamma/CLOB/Data API), reaproveitado entre ticks.
+
+    Mantém as conexões TLS abertas (keep-alive) e usa HTTP/2 quando disponível.
+    gzip/deflate já é anunciado por padrão pelo httpx (Accept-Encoding).
+    """
+    global _http
+    if _http is None:
+        _http = httpx.Client(
+            timeout=8,
+            http2=HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=120),
+        )
+    return _http
+
+
+def close_http_client() -> None:
+    global _http
+    if _http is not None:
+        _http.close()
+        _http = None
+
+
+# Pool persistente para a busca paralela por ativo (evita criar 4 threads a cada tick)
+_price_pool = ThreadPoolExecutor(max_workers=len(ASSETS), thread_name_prefix="prices")
+
+
+# Última busca com algum preço: {"t": monotonic, "window": window_ts, "data": (out, latency)}
+_last_good_prices: dict = {"t": 0.0, "window": None, "data": None}
+
+
+def fetch_live_prices(book_fallback: bool = True, max_age: float = 0) -> dict:
+    """Preço % atual (YES mid, NO mid, YES spread) ao vivo por ativo.
+
+    Os ativos são consultados em paralelo (I/O-bound): latência total ≈ ativo mais lento,
+    não a soma dos 4. Com max_age > 0, devolve a última busca boa da mesma janela se ela
+    tiver menos de max_age segundos.
+    """
     out = {a: {"yes": None, "no": None, "spread": None} for a in ASSETS}
     if not httpx:
-        return out
+        return out, 0
     now = int(time.time())
     window_ts = (now // 900) * 900
+    cached = _last_good_prices
+    if (max_age > 0 and cached["window"] == window_ts
+            and time.monotonic() - cached["t"] < max_age):
+        return cached["data"]
+    _prune_caches(window_ts)
     t0 = time.monotonic()
     try:
-        with httpx.Client(timeout=8) as c:
-            for asset in ASSETS:
-                for wts in [window_ts, window_ts - 900]:
-                    slug = f"{asset}-updown-15m-{wts}"
-                    r = c.get(f"{GAMMA_HOST}/events/slug/{slug}")
-                    if r.status_code != 200:
-                        continue
-                    event = r.json()
-                    markets = event.get("markets", [])
-                    if not markets:
-                        continue
-                    raw = markets[0].get("clobTokenIds")
-                    tokens = json.loads(raw) if isinstance(raw, str) else (raw or [])
-                    if len(tokens) < 2:
-                        continue
-                    yes_token, no_token = tokens[0], tokens[1]
-                    yes_p = _clob_price(c, yes_token)
-                    no_p = _clob_price(c, no_token)
-                    _, spread = _book_spread(c, yes_token)
-                    if yes_p is None:
-                        mid, sp = _book_spread(c, yes_token)
-                        if mid is not None:
-                            yes_p = mid
-                        if spread is None:
-                            spread = sp
-                    if no_p is None:
-                        mid, _ = _book_spread(c, no_token)
-                        if mid is not None:
-                            no_p = mid
-                    out[asset] = {"yes": yes_p, "no": no_p, "spread": spread}
-                    break  # Encontrou mercado ativo
+        c = http_client()
+        futures = {a: _price_pool.submit(_fetch_asset_prices, c, a, window_ts, book_fallback) for a in ASSETS}
+        for asset, fut in futures.items():
+            try:
+                out[asset] = fut.result()
+            except Exception:
+                pass
     except Exception:
         pass
     latency = round((time.monotonic() - t0) * 1000)
+    if any(p["yes"] is not None or p["no"] is not None for p in out.values()):
+        _last_good_prices.update(t=time.monotonic(), window=window_ts, data=(out, latency))
     return out, latency
 
 
-# ─── Portfolio / saldo (atualizado por ciclo 15 min) ──────────────────────────
+# ─── Portfolio / saldo (thread de preços, a cada BALANCE_REFRESH_SECONDS) ──
 
 DATA_API = os.getenv("POLYMARKET_DATA_API", "https://data-api.polymarket.com")
+_ADDR_RE = re.compile(r"0x[0-9a-fA-F]{40}")  # endereço EVM: prefixo + tamanho + hex numa só checagem
 
+
+@lru_cache(maxsize=1)
 def _balance_wallet_address() -> str | None:
     """Wallet cujo saldo mostrar: FUNDER (proxy wallet) primeiro — é onde fica o USDC na Polymarket.
-    Data API retorna value=0 para EOA; o dinheiro está na proxy/funder."""
+    Data API retorna value=0 para EOA; o dinheiro está na proxy/funder.
+
+    Depende só do .env: resolvido uma vez (sem Account.from_key a cada atualização de saldo).
+    """
     # FUNDER primeiro — proxy wallet onde fica o USDC
     funder = (os.getenv("POLYMARKET_FUNDER") or "").strip()
-    if funder:
-        return funder if funder.startswith("0x") else "0x" + funder
+    if funder and not funder.startswith("0x"):
+        funder = "0x" + funder
+    if _ADDR_RE.fullmatch(funder):
+        return funder
     # Fallback: derivar EOA da private key
     try:
         from eth_account import Account
@@ -200,16 +402,16 @@ def _get_proxy_wallet(eoa: str) -> str | None:
     if not httpx or not eoa:
         return None
     try:
-        r = httpx.get(
+        r = http_client().get(
             f"{GAMMA_HOST.rstrip('/')}/public-profile",
             params={"address": eoa},
             timeout=8,
         )
         if r.status_code != 200:
             return None
-        data = r.json()
+        data = _loads(r.content)
         proxy = (data.get("proxyWallet") or "").strip()
-        if proxy and len(proxy) == 42 and proxy.startswith("0x"):
+        if _ADDR_RE.fullmatch(proxy):
             return proxy
     except Exception:
         pass
@@ -218,6 +420,8 @@ def _get_proxy_wallet(eoa: str) -> str | None:
 
 def _parse_value(raw) -> float | None:
     """Extrai valor numérico (número, string ou dict com value)."""
+    while isinstance(raw, dict):
+        raw = raw.get("value") or raw.get("totalValue") or raw.get("balance")
     if raw is None:
         return None
     if isinstance(raw, (int, float)):
@@ -227,8 +431,6 @@ def _parse_value(raw) -> float | None:
             return float(raw.replace(",", ".").strip())
         except ValueError:
             return None
-    if isinstance(raw, dict):
-        return _parse_value(raw.get("value") or raw.get("totalValue") or raw.get("balance"))
     return None
 
 
@@ -237,10 +439,10 @@ def _fetch_portfolio_from_api(wallet: str) -> tuple[float | None, float | None]:
     if not httpx:
         return None, None
     try:
-        r = httpx.get(f"{DATA_API.rstrip('/')}/value", params={"user": wallet}, timeout=10)
+        r = http_client().get(f"{DATA_API.rstrip('/')}/value", params={"user": wallet}, timeout=10)
         if r.status_code != 200:
             return None, None
-        data = r.json()
+        data = _loads(r.content)
         avail_keys = ("available", "availableToTrade", "available_to_trade", "cash", "balance")
         value_keys = ("value", "totalValue", "total_value", "balance")
         v, a = None, None
@@ -264,33 +466,43 @@ def _fetch_portfolio_from_api(wallet: str) -> tuple[float | None, float | None]:
     return None, None
 
 
+USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+_USDC_ABI = [{"constant": True, "inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}]
+# rpc_url -> contrato USDC já instanciado (Web3 + HTTPProvider com sessão HTTP reaproveitada)
+_USDC_CONTRACTS: dict = {}
+_usdc_rpc_ok: str | None = None  # último RPC que respondeu; tentado primeiro
+
+
+def _usdc_contract(Web3, rpc: str, request_kwargs: dict):
+    usdc = _USDC_CONTRACTS.get(rpc)
+    if usdc is None:
+        w3 = Web3(Web3.HTTPProvider(rpc, request_kwargs=request_kwargs))
+        usdc = w3.eth.contract(address=Web3.to_checksum_address(USDC_ADDRESS), abi=_USDC_ABI)
+        _USDC_CONTRACTS[rpc] = usdc
+    return usdc
+
+
 def _fetch_usdc_on_chain(wallet: str) -> float | None:
     """Saldo USDC on-chain (Polygon) como fallback."""
+    global _usdc_rpc_ok
     try:
         from web3 import Web3
     except ImportError:
         return None
-    usdc_address = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
-    abi = [{"constant": True, "inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}]
     try:
-        from polygon_rpc import get_web3_with_fallback, get_polygon_rpc_list
+        from polygon_rpc import get_polygon_rpc_list, get_request_kwargs_for_rpc
         urls = get_polygon_rpc_list()
-        w3 = get_web3_with_fallback(timeout=5) if get_web3_with_fallback else None
     except ImportError:
         urls = [os.getenv("POLYGON_RPC", "https://polygon-rpc.com")]
-        w3 = None
-    if w3:
-        try:
-            usdc = w3.eth.contract(address=Web3.to_checksum_address(usdc_address), abi=abi)
-            raw = usdc.functions.balanceOf(Web3.to_checksum_address(wallet)).call()
-            return raw / 1e6
-        except Exception:
-            pass
+        get_request_kwargs_for_rpc = None
+    if _usdc_rpc_ok in urls:
+        urls = [_usdc_rpc_ok] + [u for u in urls if u != _usdc_rpc_ok]
     for rpc in urls:
         try:
-            w3 = Web3(Web3.HTTPProvider(rpc, request_kwargs={"timeout": 5}))
-            usdc = w3.eth.contract(address=Web3.to_checksum_address(usdc_address), abi=abi)
+            req = get_request_kwargs_for_rpc(rpc, timeout=5) if get_request_kwargs_for_rpc else {"timeout": 5}
+            usdc = _usdc_contract(Web3, rpc, req)
             raw = usdc.functions.balanceOf(Web3.to_checksum_address(wallet)).call()
+            _usdc_rpc_ok = rpc
             return raw / 1e6
         except Exception:
             continue
@@ -318,27 +530,72 @@ def fetch_usdc_balance() -> tuple[float | None, float | None]:
 
 # ─── Log ──────────────────────────────────────────────────────────────────────
 
+LOG_READ_BUFFER = 1 << 20  # 1 MB: logs JSONL lidos em binário, bytes direto para o parser
+MAX_EVENTS = 5000          # eventos do dia mantidos em memória (stats do dia)
+# Campos do evento lidos pelo dashboard (stats, tabela de mercados, últimas ordens)
+EVENT_FIELDS = (
+    "ts", "market", "cycle_end_ts", "end_ts", "action", "state", "side",
+    "price", "size", "balance", "win", "pnl", "order_id",
+)
+
+if msgspec is not None:
+    # Decoder com TypedDict: campos fora de EVENT_FIELDS são pulados no parse (nem viram objetos)
+    _Event = TypedDict("_Event", {k: Any for k in EVENT_FIELDS}, total=False)
+    _EVENT_DECODER = msgspec.json.Decoder(_Event)
+else:
+    _EVENT_DECODER = None
+
+
+def normalize_event(e: dict) -> dict:
+    """Normaliza o evento uma vez na leitura: market em minúsculas ("" se ausente) e
+    cycle = cycle_end_ts ou end_ts. Stats e tabela leem e["market"]/e["cycle"] direto."""
+    e["market"] = (e.get("market") or "").lower()
+    e["cycle"] = e.get("cycle_end_ts") or e.get("end_ts")
+    return e
+
+
+def _parse_event(line: bytes) -> dict:
+    """Decodifica uma linha JSONL do bot mantendo só EVENT_FIELDS. Linha inválida: ValueError."""
+    if _EVENT_DECODER is not None:
+        return normalize_event(_EVENT_DECODER.decode(line))
+    e = _loads(line)
+    if not isinstance(e, dict):
+        raise ValueError("evento não é um objeto JSON")
+    return normalize_event({k: e[k] for k in EVENT_FIELDS if k in e})
+
+
+LOG_PREFIX = "bot_15min_"  # LOG_DIR é compartilhado com os logs dos outros bots (bot_1h_, bot_4h_, ...)
+
+
 def get_log_path():
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    return LOG_DIR / f"bot_15min_{today}.jsonl"
+    return LOG_DIR / f"{LOG_PREFIX}{today}.jsonl"
 
 
 def load_all_historical_events(max_files: int = 31, max_lines_total: int = 50000) -> list[dict]:
     """Carrega eventos de todos os logs bot_15min_*.jsonl para cálculo de histórico total."""
-    import glob
     events: list[dict] = []
-    pattern = str(LOG_DIR / "bot_15min_*.jsonl")
-    for path in sorted(glob.glob(pattern), reverse=True)[:max_files]:
+    try:
+        with os.scandir(LOG_DIR) as it:
+            names = [e.name for e in it if e.name.startswith("bot_15min_") and e.name.endswith(".jsonl")]
+    except OSError:
+        names = []
+    # Nome tem a data (YYYY-MM-DD): os max_files maiores são os mais recentes, sem ordenar tudo
+    for name in heapq.nlargest(max_files, names):
+        path = LOG_DIR / name
         try:
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass
+            with open(path, "rb") as f:
+                data = f.read()  # arquivo inteiro de uma vez; split em bytes é feito em C
+            for line in data.split(b"\n"):
+                if not line or line.isspace():
+                    continue
+                try:
+                    e = _loads(line)
+                except ValueError:  # json/orjson JSONDecodeError
+                    continue
+                if isinstance(e, dict):
+                    # Mesmo formato de load_events: compute_stats lê e["market"]/e["cycle"]
+                    events.append(normalize_event(e))
         except Exception:
             pass
         if len(events) >= max_lines_total:
@@ -350,29 +607,55 @@ def load_all_historical_events(max_files: int = 31, max_lines_total: int = 50000
     return events
 
 
-def load_events(path: Path, max_lines: int = 5000) -> list[dict]:
+def _tail_lines(f, max_lines: int, chunk_size: int = 64 * 1024) -> list[bytes]:
+    """Últimas max_lines linhas de um arquivo binário, lendo blocos de trás para frente."""
+    f.seek(0, 2)
+    size = f.tell()
+    buf = b""
+    offset = size
+    while offset > 0 and buf.count(b"\n") <= max_lines:
+        step = min(chunk_size, offset)
+        offset -= step
+        f.seek(offset)
+        buf = f.read(step) + buf
+    lines = buf.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()  # newline final do arquivo
+    if offset > 0:
+        lines = lines[1:]  # primeira linha pode estar cortada no meio
+    return lines[-max_lines:]
+
+
+def load_events(path: Path, max_lines: int = MAX_EVENTS) -> list[dict]:
+    """Eventos das últimas max_lines linhas do log (não lê o início de logs grandes)."""
     if not path.exists():
         return []
     events = []
     try:
-        with open(path) as f:
-            for line in f:
+        with open(path, "rb") as f:
+            for line in _tail_lines(f, max_lines):
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
+                    events.append(_parse_event(line))
+                except ValueError:  # JSON inválido ou que não é objeto
                     pass
     except Exception:
         pass
-    return events[-max_lines:] if len(events) > max_lines else events
+    return events
+
+
+@lru_cache(maxsize=2048)
+def _format_hms(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%H:%M:%S")
 
 
 def format_ts(ts: int | None) -> str:
     if ts is None:
         return "--:--:--"
-    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%H:%M:%S")
+    # Mesmos ts (janela, últimas ordens) se repetem a cada frame; %H:%M:%S ignora a fração
+    return _format_hms(int(ts))
 
 
 def format_expiry(seconds: int) -> str:
@@ -388,40 +671,47 @@ def format_expiry(seconds: int) -> str:
 
 # ─── Estatísticas ────────────────────────────────────────────────────────────
 
-def _median_ms(lst: list[float]) -> int | None:
-    """Mediana da lista em ms. Retorna None se vazia."""
-    if not lst:
+def _median_ms(s: list[float]) -> int | None:
+    """Mediana em ms de uma lista já ordenada (ver _track_order_latency). Retorna None se vazia."""
+    if not s:
         return None
-    s = sorted(lst)
     n = len(s)
     if n % 2 == 1:
         return int(s[n // 2])
     return int((s[n // 2 - 1] + s[n // 2]) / 2)
 
 
+def _track_order_latency(pending: dict, out: list[float], e: dict) -> None:
+    """Pareia PLACING_ORDER -> ORDER_PLACED/ORDER_FAILED por (market, cycle) e registra a latência.
+
+    out é mantida ordenada (insort), então a mediana sai direto do meio da lista.
+    """
+    market = e["market"]
+    cycle = e["cycle"]
+    action = e.get("action", "")
+    ts = e.get("ts")
+    if action == "PLACING_ORDER" and cycle is not None and ts is not None:
+        pending[(market, cycle)] = ts
+    if action in ("ORDER_PLACED", "ORDER_FAILED"):
+        key = (market, cycle)
+        if key in pending and ts is not None:
+            bisect.insort(out, (ts - pending[key]) * 1000)
+        if key in pending:
+            del pending[key]
+
+
 def compute_order_latencies_ms(events: list[dict]) -> list[float]:
-    """Retorna lista de latências em ms (PLACING_ORDER -> ORDER_PLACED/ORDER_FAILED) por (market, cycle)."""
+    """Latências em ms (PLACING_ORDER -> ORDER_PLACED/ORDER_FAILED) por (market, cycle), ordenadas."""
     pending: dict[tuple[str, int], int] = {}
     out: list[float] = []
     for e in events:
-        market = (e.get("market") or "").lower()
-        cycle = e.get("cycle_end_ts") or e.get("end_ts")
-        action = e.get("action", "")
-        ts = e.get("ts")
-        if action == "PLACING_ORDER" and cycle is not None and ts is not None:
-            pending[(market, cycle)] = ts
-        if action in ("ORDER_PLACED", "ORDER_FAILED"):
-            key = (market, cycle)
-            if key in pending and ts is not None:
-                out.append((ts - pending[key]) * 1000)
-            if key in pending:
-                del pending[key]
+        _track_order_latency(pending, out, e)
     return out
 
 
-def compute_stats(events: list[dict]) -> dict:
-    """Calcula P&L, win rate, contagens a partir dos eventos do dia."""
-    stats = {
+def new_stats() -> dict:
+    """Acumulador vazio de estatísticas do dia (ver update_stats)."""
+    return {
         "total_cycles": 0,
         "entered_cycles": 0,
         "filled_count": 0,
@@ -429,132 +719,205 @@ def compute_stats(events: list[dict]) -> dict:
         "skipped_count": 0,
         "pnl_usdc": 0.0,          # Estimado (assume 100% win)
         "pnl_real": 0.0,          # Real (de POSITION_RESULT)
-        "trades_by_market": defaultdict(lambda: {"filled": 0, "failed": 0, "pnl": 0.0, "pnl_real": 0.0}),
+        "trades_by_market": {a: {"filled": 0, "failed": 0, "pnl": 0.0, "pnl_real": 0.0} for a in ASSETS},
         "last_balance": None,
-        "order_latencies_ms": [],
+        "order_latencies_ms": [],  # ordenada (mediana em O(1))
         "position_results": [],  # lista de {"win": bool, "pnl": float, "market": str} para Win Rate real
+        # Estado interno para atualização incremental
+        "_seen_cycles": set(),      # (market, cycle_end_ts)
+        "_entered_cycles": set(),
+        "_pending_orders": {},      # (market, cycle) -> ts do PLACING_ORDER
     }
 
-    seen_cycles = set()  # (market, cycle_end_ts)
-    entered_cycles = set()
 
-    stats["order_latencies_ms"] = compute_order_latencies_ms(events)
+def _on_new_cycle(stats: dict, e: dict, market: str, cycle) -> None:
+    if cycle:
+        stats["_seen_cycles"].add((market, cycle))
+
+
+def _on_placing_order(stats: dict, e: dict, market: str, cycle) -> None:
+    if cycle:
+        stats["_entered_cycles"].add((market, cycle))
+
+
+def _on_filled(stats: dict, e: dict, market: str, cycle) -> None:
+    stats["filled_count"] += 1
+    m = stats["trades_by_market"].get(market)
+    price = _to_float(e.get("price"))
+    if price is not None:
+        # Lucro estimado: (1.00 - preço_entrada) × shares
+        # Quando o mercado resolve a favor, recebe $1 por share
+        size = _to_float(e.get("size")) or 6
+        profit = (1.0 - price) * size
+        stats["pnl_usdc"] += profit
+        if m is not None:
+            m["pnl"] += profit
+    if m is not None:
+        m["filled"] += 1
+
+
+def _on_failed(stats: dict, e: dict, market: str, cycle) -> None:
+    stats["failed_count"] += 1
+    m = stats["trades_by_market"].get(market)
+    if m is not None:
+        m["failed"] += 1
+
+
+def _on_position_result(stats: dict, e: dict, market: str, cycle) -> None:
+    win = e.get("win")
+    pnl = _to_float(e.get("pnl"))
+    if win is not None:
+        stats["position_results"].append({"win": bool(win), "pnl": pnl or 0.0, "market": market})
+        stats["pnl_real"] += pnl or 0.0
+        m = stats["trades_by_market"].get(market)
+        if m is not None:
+            m["pnl_real"] += pnl or 0.0
+
+
+def _on_skip_price_oor(stats: dict, e: dict, market: str, cycle) -> None:
+    stats["skipped_count"] += 1
+
+
+# action -> handler: um lookup por evento; ações sem efeito nas stats não fazem nada
+_STATS_HANDLERS = {
+    "NEW_CYCLE": _on_new_cycle,
+    "PLACING_ORDER": _on_placing_order,
+    "FILLED": _on_filled,
+    "ORDER_FAILED": _on_failed,
+    "TIMEOUT_CANCEL": _on_failed,
+    "CANCEL_HARD_STOP": _on_failed,
+    "POSITION_RESULT": _on_position_result,
+    "SKIP_PRICE_OOR": _on_skip_price_oor,
+}
+_LATENCY_ACTIONS = frozenset({"PLACING_ORDER", "ORDER_PLACED", "ORDER_FAILED"})
+
+
+def update_stats(stats: dict, events) -> dict:
+    """Acrescenta eventos novos às estatísticas (O(novos eventos), não O(dia))."""
+    pending = stats["_pending_orders"]
+    latencies = stats["order_latencies_ms"]
 
     for e in events:
-        market = (e.get("market") or "").lower()
-        cycle = e.get("cycle_end_ts") or e.get("end_ts")
         action = e.get("action", "")
-
-        if action == "NEW_CYCLE" and cycle:
-            seen_cycles.add((market, cycle))
-
-        if action == "PLACING_ORDER" and cycle:
-            entered_cycles.add((market, cycle))
-
-        if action == "FILLED":
-            stats["filled_count"] += 1
-            price = _to_float(e.get("price"))
-            if price is not None:
-                # Lucro estimado: (1.00 - preço_entrada) × shares
-                # Quando o mercado resolve a favor, recebe $1 por share
-                size = _to_float(e.get("size")) or 6
-                profit = (1.0 - price) * size
-                stats["pnl_usdc"] += profit
-                stats["trades_by_market"][market]["pnl"] += profit
-            stats["trades_by_market"][market]["filled"] += 1
-
-        if action in ("ORDER_FAILED", "TIMEOUT_CANCEL", "CANCEL_HARD_STOP"):
-            stats["failed_count"] += 1
-            stats["trades_by_market"][market]["failed"] += 1
-
-        if action == "POSITION_RESULT":
-            win = e.get("win")
-            pnl = _to_float(e.get("pnl"))
-            if win is not None:
-                stats["position_results"].append({"win": bool(win), "pnl": pnl or 0.0, "market": market})
-                stats["pnl_real"] += pnl or 0.0
-                stats["trades_by_market"][market]["pnl_real"] += pnl or 0.0
-
-        if action == "SKIP_PRICE_OOR":
-            stats["skipped_count"] += 1
-
-        if "balance" in e and e["balance"] is not None:
-            stats["last_balance"] = _to_float(e["balance"])
-
-    stats["total_cycles"] = len(seen_cycles)
-    stats["entered_cycles"] = len(entered_cycles)
+        if action in _LATENCY_ACTIONS:
+            _track_order_latency(pending, latencies, e)
+        handler = _STATS_HANDLERS.get(action)
+        if handler is not None:
+            handler(stats, e, e["market"], e["cycle"])
+        balance = e.get("balance")
+        if balance is not None:
+            stats["last_balance"] = _to_float(balance)
+
+    stats["total_cycles"] = len(stats["_seen_cycles"])
+    stats["entered_cycles"] = len(stats["_entered_cycles"])
 
     return stats
 
 
+def compute_stats(events: list[dict]) -> dict:
+    """Calcula P&L, win rate, contagens a partir dos eventos do dia (normalizados, ver normalize_event)."""
+    return update_stats(new_stats(), events)
+
+
 # ─── Barra de Progresso ──────────────────────────────────────────────────────
 
+# Cor por fase do ciclo: limites de pct (>=) e cor de cada faixa
+_BAR_THRESHOLDS = (0.67, 0.80, 0.93)  # perto da janela, janela de entrada (4min-1min), últimos segundos
+_BAR_COLORS = (C.BLUE, C.CYAN, C.YELLOW, C.RED + C.BOLD)
+
+
+@lru_cache(maxsize=None)
+def _bar_body(filled: int, width: int) -> str:
+    return "█" * filled + "░" * (width - filled)
+
+
 def progress_bar(elapsed: int, total: int, width: int = 30) -> str:
     """Barra de progresso visual: [████████░░░░] 63%"""
     if total <= 0:
         return "[" + "░" * width + "]   0%"
     pct = min(1.0, max(0.0, elapsed / total))
-    filled = int(width * pct)
-    bar = "█" * filled + "░" * (width - filled)
-
-    # Cor baseada no progresso
-    if pct >= 0.93:  # Últimos segundos
-        color = C.RED + C.BOLD
-    elif pct >= 0.80:  # Janela de entrada (4min-1min)
-        color = C.YELLOW
-    elif pct >= 0.67:  # Perto da janela
-        color = C.CYAN
-    else:
-        color = C.BLUE
-
-    return f"{color}[{bar}]{C.RESET} {pct*100:3.0f}%"
+    color = _BAR_COLORS[bisect.bisect_right(_BAR_THRESHOLDS, pct)]
+    return f"{color}[{_bar_body(int(width * pct), width)}]{C.RESET} {pct*100:3.0f}%"
 
 
 # ─── Colorir estado ──────────────────────────────────────────────────────────
+# Domínio pequeno (estados/ações/preços em %) e chamadas a cada frame: resultados em cache.
+
+_STATE_COLORED = {
+    s: f"{color}{s}{C.RESET}"
+    for s, color in (
+        ("HOLDING", C.GREEN + C.BOLD),
+        ("ORDER_PLACED", C.YELLOW),
+        ("DONE", C.GREEN),
+        ("FILLED", C.GREEN),
+        ("SKIPPED", C.RED),
+        ("ORDER_FAILED", C.RED),
+        ("IDLE", C.GRAY),
+    )
+}
+
+_RESULT_COLORED = {
+    r: f"{color}{r}{C.RESET}"
+    for r, color in (
+        ("FILLED", C.GREEN + C.BOLD),
+        ("ORDER_FAILED", C.RED),
+        ("CANCEL_HARD_STOP", C.RED),
+        ("TIMEOUT_CANCEL", C.YELLOW),
+    )
+}
+
+_ACTION_COLORED = {
+    **_RESULT_COLORED,
+    **{
+        a: f"{color}{a}{C.RESET}"
+        for a, color in (
+            ("PLACING_ORDER", C.CYAN),
+            ("ORDER_PLACED", C.CYAN),
+            ("NEW_CYCLE", C.BLUE),
+        )
+    },
+}
+
 
+@lru_cache(maxsize=256)
 def color_state(state: str) -> str:
     s = state.upper()
-    if s == "HOLDING":
-        return f"{C.GREEN}{C.BOLD}{s}{C.RESET}"
-    if s == "ORDER_PLACED":
-        return f"{C.YELLOW}{s}{C.RESET}"
-    if s in ("DONE", "FILLED"):
-        return f"{C.GREEN}{s}{C.RESET}"
-    if s in ("SKIPPED", "ORDER_FAILED"):
-        return f"{C.RED}{s}{C.RESET}"
-    if s == "IDLE":
-        return f"{C.GRAY}{s}{C.RESET}"
-    return s
+    return _STATE_COLORED.get(s, s)
 
 
+@lru_cache(maxsize=256)
 def color_action(action: str) -> str:
     a = action.upper()
-    if a == "FILLED":
-        return f"{C.GREEN}{C.BOLD}{a}{C.RESET}"
-    if a in ("ORDER_FAILED", "CANCEL_HARD_STOP"):
-        return f"{C.RED}{a}{C.RESET}"
-    if a == "TIMEOUT_CANCEL":
-        return f"{C.YELLOW}{a}{C.RESET}"
-    if a in ("PLACING_ORDER", "ORDER_PLACED"):
-        return f"{C.CYAN}{a}{C.RESET}"
-    if a == "NEW_CYCLE":
-        return f"{C.BLUE}{a}{C.RESET}"
+    colored = _ACTION_COLORED.get(a)
+    if colored is not None:
+        return colored
     if a.startswith("SKIP"):
         return f"{C.GRAY}{a}{C.RESET}"
     return a
 
 
+@lru_cache(maxsize=256)
 def color_result(result: str) -> str:
     r = result.upper()
-    if r == "FILLED":
-        return f"{C.GREEN}{C.BOLD}FILLED{C.RESET}"
-    if r in ("ORDER_FAILED", "CANCEL_HARD_STOP"):
-        return f"{C.RED}{r}{C.RESET}"
-    if r == "TIMEOUT_CANCEL":
-        return f"{C.YELLOW}{r}{C.RESET}"
-    return r
+    return _RESULT_COLORED.get(r, r)
+
+
+@lru_cache(maxsize=256)
+def color_pct(val: float | None, s: str) -> str:
+    """Colore preço YES/NO (já formatado em s) baseado no range 93-98%."""
+    if val is None:
+        return f"{C.GRAY}{s:>6}{C.RESET}"
+    if 0.93 <= val <= 0.98:
+        return f"{C.GREEN}{C.BOLD}{s:>6}{C.RESET}"
+    elif val > 0.98:
+        return f"{C.RED}{s:>6}{C.RESET}"
+    elif val >= 0.80:
+        return f"{C.YELLOW}{s:>6}{C.RESET}"
+    else:
+        return f"{C.GRAY}{s:>6}{C.RESET}"
 
 
+@lru_cache(maxsize=256)
 def color_price(price_str: str, is_entry: bool = False) -> str:
     """Colore preço: verde se >= 93%, vermelho se fora do range."""
     try:
@@ -571,86 +934,98 @@ def color_price(price_str: str, is_entry: bool = False) -> str:
 
 # ─── Dashboard principal ─────────────────────────────────────────────────────
 
-def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
-    now = int(time.time())
-    window_start = (now // WINDOW_SECONDS) * WINDOW_SECONDS
-    window_end = window_start + WINDOW_SECONDS
-    elapsed = now - window_start
-    time_to_expiry = window_end - now
-    in_entry_window = ENTRY_WINDOW_END <= time_to_expiry <= ENTRY_WINDOW_START
-
-    live_balance = None
-    live_available = None
-    if live_data is not None:
-        live_prices = live_data[0]
-        latency_ms = live_data[1]
-        if len(live_data) >= 3:
-            live_balance = live_data[2]
-        if len(live_data) >= 4:
-            live_available = live_data[3]
-    else:
-        live_prices = {a: {"yes": None, "no": None, "spread": None} for a in ASSETS}
-        latency_ms = 0
-
-    # Estatísticas do dia
-    stats = compute_stats(events)
+# Ações mostradas em "ULTIMAS ORDENS" e ações que definem o resultado do mercado no ciclo
+ORDER_ACTIONS = frozenset({"PLACING_ORDER", "ORDER_PLACED", "FILLED", "TIMEOUT_CANCEL", "CANCEL_HARD_STOP", "ORDER_FAILED"})
+RESULT_ACTIONS = frozenset({"FILLED", "TIMEOUT_CANCEL", "CANCEL_HARD_STOP", "ORDER_FAILED", "EXPIRED"})
+LAST_ORDERS = 10  # ordens exibidas
+
+# Partes fixas do layout (montadas uma vez; C já reflete NO_COLOR neste ponto)
+DASH_WIDTH = 88  # largura total
+_HEADER_LINES = [
+    "",
+    f"{C.BOLD}{C.CYAN}{'═' * DASH_WIDTH}{C.RESET}",
+    f"{C.BOLD}{C.CYAN}  BOT 15MIN — DASHBOARD LIVE v2{C.RESET}",
+    f"{C.BOLD}{C.CYAN}{'═' * DASH_WIDTH}{C.RESET}",
+]
+CLOCK_LINE = len(_HEADER_LINES)  # índice da primeira linha de clock_lines() no frame
+_STATS_TITLE = f"  {C.BOLD}{'─' * 42} STATS DO DIA {'─' * 32}{C.RESET}"
+_MARKETS_TITLE = f"  {C.BOLD}{'─' * 42} MERCADOS {'─' * 36}{C.RESET}"
+_MARKETS_HEADER = (
+    f"  {C.BOLD}{'ATIVO':<6}│{'YES':>6} {'NO':>6} {'SPRD':>6} │"
+    f" {'ESTADO':<14}│ {'ACAO':<18}│ {'LADO':<5}│ {'PRECO':<7}│ {'RESULTADO':<16}{C.RESET}"
+)
+_MARKETS_SEP = f"  {'─' * 6}┼{'─' * 20}┼{'─' * 15}┼{'─' * 19}┼{'─' * 6}┼{'─' * 8}┼{'─' * 16}"
+_ORDERS_TITLE = f"  {C.BOLD}{'─' * 42} ULTIMAS ORDENS {'─' * 30}{C.RESET}"
+# Linhas da tabela e das últimas ordens: cores e larguras fixas já embutidas no template.
+# Colunas coloridas levam +9 na largura para compensar os escapes ANSI (não ocupam espaço na tela).
+_MARKET_ROW = (
+    f"  {C.BOLD}{{asset:<6}}{C.RESET}│"
+    "{yes} {no} {spread} │"
+    " {state:<23}│"
+    " {action:<27}│"
+    " {side:<5}│"
+    " {price:<7}│"
+    " {result}"
+).format
+_ORDER_ROW = (
+    f"  {C.DIM}[{{ts}}]{C.RESET} {C.BOLD}{{market:<4}}{C.RESET} {{action:<27}} "
+    f"{{side:<14}} {{price:<7}} {C.DIM}{{oid}}{C.RESET}"
+).format
+
+def group_by_cycle(events, by_cycle: dict | None = None) -> dict[int, list[dict]]:
+    """Agrupa eventos (normalizados) por ciclo. Passe by_cycle para acrescentar incrementalmente."""
+    if by_cycle is None:
+        by_cycle = defaultdict(list)
+    for e in events:
+        cycle = e["cycle"]
+        if cycle is not None:
+            by_cycle[cycle].append(e)
+    return by_cycle
 
-    # Por mercado: último estado no ciclo atual
-    current_cycle = window_end
-    by_market = defaultdict(lambda: {"state": "—", "action": "—", "side": "—", "price": "—", "result": "—", "ts": None})
-    order_events = []
 
-    for e in events:
-        market = e.get("market", "").upper()
-        cycle = e.get("cycle_end_ts") or e.get("end_ts")
-        action = e.get("action", "")
-        state = e.get("state", "")
-        ts = e.get("ts")
+def prune_cycles(by_cycle: dict, current_cycle: int) -> None:
+    """Descarta ciclos anteriores ao ciclo passado (dashboard só mostra o atual)."""
+    for cycle in [k for k in by_cycle if k < current_cycle - WINDOW_SECONDS]:
+        del by_cycle[cycle]
 
-        if cycle != current_cycle:
-            continue
-        by_market[market]["state"] = state
-        by_market[market]["action"] = action
-        by_market[market]["ts"] = ts
-        if "side" in e:
-            by_market[market]["side"] = e.get("side", "—")
-        if "price" in e and e["price"] is not None:
-            by_market[market]["price"] = f"${float(e['price']):.2f}"
-        if action in ("FILLED", "TIMEOUT_CANCEL", "CANCEL_HARD_STOP", "ORDER_FAILED", "EXPIRED"):
-            by_market[market]["result"] = action
-
-        if action in ("PLACING_ORDER", "ORDER_PLACED", "FILLED", "TIMEOUT_CANCEL", "CANCEL_HARD_STOP", "ORDER_FAILED"):
-            order_events.append(e)
 
-    last_orders = order_events[-10:]
+def _live_balance(live_data: tuple | None) -> tuple[float | None, float | None]:
+    """(portfolio, disponível) publicados pela thread de preços, ou (None, None)."""
+    if live_data is None:
+        return None, None
+    live_balance = live_data[2] if len(live_data) >= 3 else None
+    live_available = live_data[3] if len(live_data) >= 4 else None
+    return live_balance, live_available
 
-    # ─── Renderizar ───────────────────────────────────────────────────────
 
-    W = 88  # largura total
-    lines = []
+def clock_lines(now: int, live_data: tuple | None, stats: dict) -> list[str]:
+    """Linhas do frame que mudam a cada segundo: relógio/janela/portfolio e barra de progresso.
 
-    # Header
-    lines.append("")
-    lines.append(f"{C.BOLD}{C.CYAN}{'═' * W}{C.RESET}")
-    lines.append(f"{C.BOLD}{C.CYAN}  BOT 15MIN — DASHBOARD LIVE v2{C.RESET}")
-    lines.append(f"{C.BOLD}{C.CYAN}{'═' * W}{C.RESET}")
+    Ficam logo após _HEADER_LINES (ver CLOCK_LINE); o main() reescreve só elas quando
+    eventos e preços não mudaram.
+    """
+    window_start = (now // WINDOW_SECONDS) * WINDOW_SECONDS
+    window_end = window_start + WINDOW_SECONDS
+    elapsed = now - window_start
+    time_to_expiry = window_end - now
+    live_balance, live_available = _live_balance(live_data)
 
-    # Info janela + Portfolio e dinheiro para trade (atualizados a cada 10s)
+    # Info janela + Portfolio e dinheiro para trade (atualizados pela thread de preços)
     utc_now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
     portfolio_val = live_balance if live_balance is not None else stats.get("last_balance")
     portfolio_str = f"${portfolio_val:.2f}" if portfolio_val is not None else "—"
     available_val = live_available if live_available is not None else portfolio_val
     available_str = f"${available_val:.2f}" if available_val is not None else "—"
     expiry_str = format_expiry(time_to_expiry)
-    lines.append(f"  {C.DIM}UTC:{C.RESET} {utc_now}    "
-                 f"{C.DIM}Janela:{C.RESET} {format_ts(window_start)}—{format_ts(window_end)}    "
-                 f"{C.DIM}Expira em:{C.RESET} {C.BOLD}{expiry_str}{C.RESET}    "
-                 f"{C.DIM}Portfolio:{C.RESET} {C.BOLD}{portfolio_str}{C.RESET}    "
-                 f"{C.DIM}Dinheiro para trade:{C.RESET} {C.BOLD}{available_str}{C.RESET}")
+    info = (f"  {C.DIM}UTC:{C.RESET} {utc_now}    "
+            f"{C.DIM}Janela:{C.RESET} {format_ts(window_start)}—{format_ts(window_end)}    "
+            f"{C.DIM}Expira em:{C.RESET} {C.BOLD}{expiry_str}{C.RESET}    "
+            f"{C.DIM}Portfolio:{C.RESET} {C.BOLD}{portfolio_str}{C.RESET}    "
+            f"{C.DIM}Dinheiro para trade:{C.RESET} {C.BOLD}{available_str}{C.RESET}")
 
     # Barra de progresso
     bar = progress_bar(elapsed, WINDOW_SECONDS, width=40)
-    if in_entry_window:
+    if ENTRY_WINDOW_END <= time_to_expiry <= ENTRY_WINDOW_START:
         entry_tag = f"  {C.BG_YELLOW}{C.BOLD} JANELA DE ENTRADA (4min→1min) {C.RESET}"
     elif time_to_expiry < ENTRY_WINDOW_END:
         entry_tag = f"  {C.BG_RED}{C.BOLD} HARD STOP (<1min) {C.RESET}"
@@ -658,11 +1033,74 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
         entry_tag = f"  {C.DIM}Aguardando janela de entrada...{C.RESET}"
     else:
         entry_tag = ""
-    lines.append(f"  {bar}{entry_tag}")
+    return [info, f"  {bar}{entry_tag}"]
+
+
+def build_dashboard(events: list[dict], live_data: tuple | None = None,
+                    events_by_cycle: dict | None = None, last_orders: deque | None = None,
+                    stats: dict | None = None) -> str:
+    """Monta o frame do dashboard.
+
+    events vêm de load_events (já normalizados). events_by_cycle, last_orders (deque das
+    últimas ordens, qualquer ciclo) e stats são mantidos incrementalmente pelo main(); se
+    omitidos, são derivados de events.
+    """
+    now = int(time.time())
+    current_cycle = (now // WINDOW_SECONDS + 1) * WINDOW_SECONDS
+
+    live_balance, live_available = _live_balance(live_data)
+    if live_data is not None:
+        live_prices = live_data[0]
+        latency_ms = live_data[1]
+    else:
+        live_prices = {a: {"yes": None, "no": None, "spread": None} for a in ASSETS}
+        latency_ms = 0
+
+    # Estatísticas do dia
+    if stats is None:
+        stats = compute_stats(events)
+
+    # Por mercado: último estado no ciclo atual
+    by_market = {
+        a: {"state": "—", "action": "—", "side": "—", "price": "—", "result": "—", "ts": None}
+        for a in ASSETS
+    }
+    order_events = []
+    if events_by_cycle is None:
+        events_by_cycle = group_by_cycle(events)
+
+    for e in events_by_cycle.get(current_cycle, ()):
+        action = e.get("action", "")
+        m = by_market.get(e["market"])
+        if m is not None:  # mercados fora de ASSETS não aparecem na tabela
+            m["state"] = e.get("state", "")
+            m["action"] = action
+            m["ts"] = e.get("ts")
+            if "side" in e:
+                m["side"] = e.get("side", "—")
+            if "price" in e and e["price"] is not None:
+                m["price"] = f"${float(e['price']):.2f}"
+            if action in RESULT_ACTIONS:
+                m["result"] = action
+
+        if last_orders is None and action in ORDER_ACTIONS:
+            order_events.append(e)
+
+    if last_orders is None:
+        last_orders = order_events[-LAST_ORDERS:]
+    else:
+        # Ordens do ciclo atual são as mais novas: se houver alguma, estão no fim do deque
+        last_orders = [e for e in last_orders if e["cycle"] == current_cycle]
+
+    # ─── Renderizar ───────────────────────────────────────────────────────
+
+    # Header + info da janela e barra de progresso
+    lines = list(_HEADER_LINES)
+    lines.extend(clock_lines(now, live_data, stats))
 
     # ─── Painel de estatísticas ───────────────────────────────────────────
     lines.append("")
-    lines.append(f"  {C.BOLD}{'─' * 42} STATS DO DIA {'─' * 32}{C.RESET}")
+    lines.append(_STATS_TITLE)
 
     total_trades = stats["filled_count"] + stats["failed_count"]
     exec_rate = (stats["filled_count"] / total_trades * 100) if total_trades > 0 else 0
@@ -674,11 +1112,11 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
     has_real_pnl = total_closed > 0
     pnl = stats["pnl_real"] if has_real_pnl else stats["pnl_usdc"]
     pnl_color = C.GREEN if pnl >= 0 else C.RED
-    # Saldo: preferir valor atualizado por ciclo 15 min (live_balance), senão do log
+    # Saldo: preferir valor da thread de preços (live_balance), senão do log
     balance = live_balance if live_balance is not None else stats["last_balance"]
     bal_str = f"${balance:.2f}" if balance is not None else "—"
     if live_balance is not None:
-        bal_str = f"{C.BOLD}{bal_str}{C.RESET} {C.DIM}(atualizado por ciclo){C.RESET}"
+        bal_str = f"{C.BOLD}{bal_str}{C.RESET} {C.DIM}(atualizado a cada {BALANCE_REFRESH_SECONDS}s){C.RESET}"
 
     lines.append(
         f"  {C.DIM}Ciclos:{C.RESET} {stats['total_cycles']:>3}   "
@@ -694,7 +1132,7 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
     # P&L por mercado (mini-tabela inline)
     pnl_parts = []
     for asset in ASSETS:
-        m_stats = stats["trades_by_market"].get(asset, {"filled": 0, "pnl": 0.0, "pnl_real": 0.0})
+        m_stats = stats["trades_by_market"][asset]
         m_pnl = m_stats["pnl_real"] if has_real_pnl else m_stats["pnl"]
         m_fills = m_stats["filled"]
         if m_fills > 0:
@@ -706,16 +1144,12 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
 
     # ─── Tabela de mercados ───────────────────────────────────────────────
     lines.append("")
-    lines.append(f"  {C.BOLD}{'─' * 42} MERCADOS {'─' * 36}{C.RESET}")
-    # Header da tabela
-    lines.append(
-        f"  {C.BOLD}{'ATIVO':<6}│{'YES':>6} {'NO':>6} {'SPRD':>6} │"
-        f" {'ESTADO':<14}│ {'ACAO':<18}│ {'LADO':<5}│ {'PRECO':<7}│ {'RESULTADO':<16}{C.RESET}"
-    )
-    lines.append(f"  {'─' * 6}┼{'─' * 20}┼{'─' * 15}┼{'─' * 19}┼{'─' * 6}┼{'─' * 8}┼{'─' * 16}")
+    lines.append(_MARKETS_TITLE)
+    lines.append(_MARKETS_HEADER)
+    lines.append(_MARKETS_SEP)
 
     for asset in ASSETS:
-        m = by_market[asset.upper()]
+        m = by_market[asset]
         lp = live_prices.get(asset, {"yes": None, "no": None, "spread": None})
         yes_v = lp.get("yes")
         no_v = lp.get("no")
@@ -725,41 +1159,26 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
         no_str = f"{no_v*100:.0f}%" if no_v is not None else " — "
         spread_str = f"{spread_v*100:.1f}c" if spread_v is not None else " — "
 
-        # Colorir preço YES/NO baseado no range 93-98%
-        def _color_pct(val, s):
-            if val is None:
-                return f"{C.GRAY}{s:>6}{C.RESET}"
-            if 0.93 <= val <= 0.98:
-                return f"{C.GREEN}{C.BOLD}{s:>6}{C.RESET}"
-            elif val > 0.98:
-                return f"{C.RED}{s:>6}{C.RESET}"
-            elif val >= 0.80:
-                return f"{C.YELLOW}{s:>6}{C.RESET}"
-            else:
-                return f"{C.GRAY}{s:>6}{C.RESET}"
-
-        yes_col = _color_pct(yes_v, yes_str)
-        no_col = _color_pct(no_v, no_str)
+        yes_col = color_pct(yes_v, yes_str)
+        no_col = color_pct(no_v, no_str)
         spread_col = f"{C.DIM}{spread_str:>6}{C.RESET}" if spread_v is not None else f"{C.GRAY}{spread_str:>6}{C.RESET}"
 
         state_col = color_state(m["state"])
         action_col = color_action(m["action"])
         result_col = color_result(m["result"]) if m["result"] != "—" else f"{C.GRAY}—{C.RESET}"
 
-        # Pad to fixed widths (ANSI chars don't count for display)
-        lines.append(
-            f"  {C.BOLD}{asset.upper():<6}{C.RESET}│"
-            f"{yes_col} {no_col} {spread_col} │"
-            f" {state_col:<{14 + 9}}│"  # +9 for ANSI escape chars
-            f" {action_col:<{18 + 9}}│"
-            f" {str(m['side'])[:5]:<5}│"
-            f" {str(m['price'])[:7]:<7}│"
-            f" {result_col}"
-        )
+        lines.append(_MARKET_ROW(
+            asset=asset.upper(), yes=yes_col, no=no_col, spread=spread_col, state=state_col,
+            action=action_col, side=str(m["side"])[:5], price=str(m["price"])[:7], result=result_col,
+        ))
 
     # ─── API Latência e latência de envio de ordem (mediana) ───────────────
     lat_color = C.GREEN if latency_ms < 2000 else (C.YELLOW if latency_ms < 5000 else C.RED)
     lines.append(f"\n  {C.DIM}API latencia:{C.RESET} {lat_color}{latency_ms}ms{C.RESET}")
+    live_error = live_data[4] if live_data is not None and len(live_data) >= 5 else None
+    if live_error:
+        lines.append(f"  {C.RED}{C.BOLD}ERRO preços/saldo:{C.RESET} {C.RED}{live_error}{C.RESET}  "
+                     f"{C.DIM}(dados de {format_ts(live_data[5])}, tentando de novo){C.RESET}")
     order_lat = stats.get("order_latencies_ms") or []
     mediana_hoje = _median_ms(order_lat)
     if mediana_hoje is not None:
@@ -770,12 +1189,12 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
 
     # ─── Últimas ordens ──────────────────────────────────────────────────
     lines.append("")
-    lines.append(f"  {C.BOLD}{'─' * 42} ULTIMAS ORDENS {'─' * 30}{C.RESET}")
+    lines.append(_ORDERS_TITLE)
     if not last_orders:
         lines.append(f"  {C.GRAY}Nenhuma ordem neste ciclo.{C.RESET}")
     for e in last_orders:
         ts_str = format_ts(e.get("ts"))
-        market = (e.get("market") or "").upper()
+        market = e["market"].upper()
         action = e.get("action", "")
         side = e.get("side", "—")
         price = e.get("price")
@@ -787,12 +1206,12 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
         action_col = color_action(action)
         side_col = f"{C.GREEN}{side}{C.RESET}" if side == "YES" else (f"{C.RED}{side}{C.RESET}" if side == "NO" else side)
 
-        lines.append(f"  {C.DIM}[{ts_str}]{C.RESET} {C.BOLD}{market:<4}{C.RESET} {action_col:<{18+9}} "
-                     f"{side_col:<{5+9}} {price_str:<7} {C.DIM}{oid}{C.RESET}")
+        lines.append(_ORDER_ROW(ts=ts_str, market=market, action=action_col, side=side_col,
+                                price=price_str, oid=oid))
 
     # Footer
     lines.append("")
-    lines.append(f"  {C.DIM}Log: {get_log_path().name}  |  Atualiza: 10s  |  Ctrl+C para sair{C.RESET}")
+    lines.append(f"  {C.DIM}Log: {get_log_path().name}  |  Tela: {RENDER_SECONDS}s  Precos: {PRICE_REFRESH_ENTRY_SECONDS}s/{PRICE_REFRESH_IDLE_SECONDS}s  |  Ctrl+C para sair{C.RESET}")
     lines.append("")
 
     return "\n".join(lines)
@@ -800,56 +1219,262 @@ def build_dashboard(events: list[dict], live_data: tuple | None = None) -> str:
 
 # ─── Main loop ────────────────────────────────────────────────────────────────
 
+# Último (live_prices, latency_ms, portfolio, available, erro, atualizado_em) publicado pela
+# thread de preços. Em falha, mantém os dados anteriores com erro preenchido (dados velhos).
+_live_data: tuple | None = None
+_live_lock = threading.Lock()
+
+
+def _time_to_expiry(now: int) -> int:
+    return WINDOW_SECONDS - now % WINDOW_SECONDS
+
+
+def price_refresh_interval(now: int) -> int:
+    """Segundos até a próxima busca de preços: rápido na janela de entrada, lento longe dela.
+
+    Fora da janela, nunca dorme além do início da próxima janela de entrada.
+    """
+    tte = _time_to_expiry(now)
+    if ENTRY_WINDOW_END <= tte <= ENTRY_WINDOW_START:
+        return PRICE_REFRESH_ENTRY_SECONDS
+    if ENTRY_WINDOW_START < tte < NEAR_ENTRY_SECONDS:
+        return min(PRICE_REFRESH_NEAR_SECONDS, tte - ENTRY_WINDOW_START)
+    until_entry = tte - ENTRY_WINDOW_START if tte > ENTRY_WINDOW_START else tte + WINDOW_SECONDS - ENTRY_WINDOW_START
+    return max(1, min(PRICE_REFRESH_IDLE_SECONDS, until_entry))
+
+
+def _price_worker() -> None:
+    """Busca preços e saldo fora da thread de renderização (rede lenta não trava a tela)."""
+    global _live_data
+    portfolio = available = None
+    next_balance_at = 0.0
+    while True:
+        try:
+            tte = _time_to_expiry(int(time.time()))
+            in_entry_window = ENTRY_WINDOW_END <= tte <= ENTRY_WINDOW_START
+            # Longe da janela (nem nela nem no minuto antes) os preços são só informativos
+            far_from_entry = not (ENTRY_WINDOW_END <= tte < NEAR_ENTRY_SECONDS)
+            live_prices, latency_ms = fetch_live_prices(
+                book_fallback=in_entry_window,
+                max_age=PRICE_CACHE_MAX_AGE if far_from_entry else 0,
+            )
+            if time.time() >= next_balance_at:
+                portfolio, available = fetch_usdc_balance()
+                next_balance_at = time.time() + BALANCE_REFRESH_SECONDS
+            with _live_lock:
+                _live_data = (live_prices, latency_ms, portfolio, available, None, int(time.time()))
+            delay = price_refresh_interval(int(time.time()))
+        except Exception as e:
+            # Sem isso a thread (daemon) morre calada e a tela fica com preços velhos para sempre
+            with _live_lock:
+                last = _live_data
+                if last is None:
+                    empty = {a: {"yes": None, "no": None, "spread": None} for a in ASSETS}
+                    last = (empty, 0, None, None, None, None)
+                _live_data = (*last[:4], f"{type(e).__name__}: {e}"[:80], last[5])
+            delay = PRICE_ERROR_RETRY_SECONDS
+        time.sleep(delay)
+
+
+def _read_new_events(fd: int, pending: bytes) -> tuple[list[dict], bytes]:
+    """Lê tudo que foi anexado ao log desde a última leitura e decodifica as linhas completas.
+
+    pending é o pedaço de linha incompleta da leitura anterior; retorna (eventos, novo pending).
+    """
+    chunks = [pending]
+    while True:
+        chunk = os.read(fd, LOG_READ_BUFFER)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    data = b"".join(chunks)
+    cut = data.rfind(b"\n")
+    if cut < 0:
+        return [], data
+    events = []
+    for line in data[:cut].split(b"\n"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            events.append(_parse_event(line))
+        except ValueError:  # JSON inválido ou que não é objeto
+            pass
+    return events, data[cut + 1:]
+
+
+def _clip_line(line: str, cols: int) -> str:
+    """line cortada em cols colunas visíveis (códigos ANSI não contam nem são partidos)."""
+    if len(line) <= cols:
+        return line
+    parts = []
+    width = 0
+    pos = 0
+    for m in _ANSI_RE.finditer(line):
+        text = line[pos:m.start()]
+        if width + len(text) > cols:
+            break
+        parts.append(text)
+        parts.append(m.group())
+        width += len(text)
+        pos = m.end()
+    else:
+        if width + len(line) - pos <= cols:
+            return line
+    parts.append(line[pos:pos + cols - width])
+    parts.append(C.RESET)  # cor aberta antes do corte não vaza para a próxima linha
+    return "".join(parts)
+
+
+_term_size: tuple[int, int] | None = None  # tamanho do terminal no último frame
+
+
+def render_frame(frame: str, prev_lines: list[str] | None) -> tuple[str, list[str] | None]:
+    """Texto para o terminal mostrar frame, reescrevendo só as linhas que mudaram.
+
+    prev_lines é o retorno da chamada anterior (None = redesenhar tudo). Cada linha é
+    cortada na largura do terminal e o frame na altura (rows - 1), para que linha i do
+    frame seja sempre a row i + 1 da tela; só redesenha tudo se o terminal mudou de tamanho.
+    """
+    global _term_size
+    cols, rows = shutil.get_terminal_size()
+    lines = [_clip_line(l, cols) for l in frame.split("\n", rows - 1)[:rows - 1]]
+    if prev_lines is None or (cols, rows) != _term_size:
+        _term_size = (cols, rows)
+        return CLEAR_SCREEN + "\n".join(lines) + "\n", lines
+    out = []
+    for i, (old, new) in enumerate(zip_longest(prev_lines, lines)):
+        if new is None:
+            out.append(f"\033[{i + 1};1H\033[J")  # frame encolheu: apagar o resto
+            break
+        if old != new:
+            out.append(f"\033[{i + 1};1H\033[2K{new}")
+    out.append(f"\033[{len(lines) + 1};1H")
+    return "".join(out), lines
+
+
+def write_stdout(text: str) -> bool:
+    """Escreve text direto no fd do stdout (sem TextIOWrapper). False se o terminal não aceitou tudo."""
+    fd = sys.stdout.fileno()
+    data = memoryview(text.encode())
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _watch_log_dir():
+    """INotify em LOG_DIR (escrita/criação de arquivos) ou None se indisponível."""
+    if INotify is None:
+        return None
+    try:
+        watch = INotify()
+        watch.add_watch(str(LOG_DIR), inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO)
+        return watch
+    except OSError:
+        return None
+
+
+def _wait_for_log_change(watch, timeout_s: float) -> None:
+    """Bloqueia até o log mudar (inotify) ou timeout_s; sem inotify, apenas dorme.
+
+    O watch cobre LOG_DIR inteiro (para ver o log do dia seguinte ser criado); eventos
+    de arquivos de outros bots são descartados sem acordar o redesenho.
+    """
+    if watch is None:
+        time.sleep(timeout_s)
+        return
+    deadline = time.monotonic() + timeout_s
+    while True:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return
+        # read_delay agrupa rajadas de linhas do bot num único redesenho
+        events = watch.read(timeout=remaining_ms, read_delay=50)
+        if not events or any(ev.name.startswith(LOG_PREFIX) for ev in events):
+            return
+
+
 def main():
     log_path = get_log_path()
-    clear_cmd = "clear" if os.name != "nt" else "cls"
-    events = []
+    prev_lines = None
+    frame_lines: list[str] = []
+    frame_key = None
+    events_version = 0  # incrementa a cada mudança em events/stats (chave do frame)
     try:
+        watch = _watch_log_dir()
         if not log_path.exists():
-            print(f"{C.YELLOW}Aguardando log do dia: {log_path.name}{C.RESET}")
+            print(f"{C.YELLOW}Aguardando log do dia: {log_path.name}{C.RESET}", flush=True)
             while not log_path.exists():
-                time.sleep(1)
-        events = load_events(log_path)
-        with open(log_path, "r") as f:
-            f.seek(0, 2)
-            last_pos = f.tell()
+                _wait_for_log_change(watch, 1)  # acorda no CREATE do arquivo (ou a cada 1s)
+        threading.Thread(target=_price_worker, daemon=True).start()
+        events = deque(load_events(log_path), maxlen=MAX_EVENTS)
+        events_by_cycle = group_by_cycle(events)
+        last_orders = deque((e for e in events if e.get("action") in ORDER_ACTIONS), maxlen=LAST_ORDERS)
+        stats = compute_stats(events)
+        with open(log_path, "rb") as f:
+            last_pos = os.lseek(f.fileno(), 0, os.SEEK_END)
+            pending = b""
             while True:
-                # Ler novas linhas
-                f.seek(last_pos)
-                while True:
-                    line = f.readline()
-                    if not line:
-                        break
-                    line = line.strip()
-                    if line:
-                        try:
-                            events.append(json.loads(line))
-                            if len(events) > 5000:
-                                events = events[-4000:]
-                        except json.JSONDecodeError:
-                            pass
-                    last_pos = f.tell()
-
-                # Verificar se mudou de dia
+                # Mudou de dia (só troca quando o log novo já existe)?
+                reload = False
                 new_path = get_log_path()
-                if new_path != log_path:
+                if new_path != log_path and new_path.exists():
                     log_path = new_path
-                    if log_path.exists():
-                        events = load_events(log_path)
-                        f.close()
-                        f = open(log_path, "r")
-                        f.seek(0, 2)
-                        last_pos = f.tell()
-
-                live_prices, latency_ms = fetch_live_prices()
-                portfolio, available = fetch_usdc_balance()
-                live_data = (live_prices, latency_ms, portfolio, available)
-                os.system(clear_cmd)
-                print(build_dashboard(events, live_data))
-                time.sleep(10)
+                    reload = True
+
+                # Ler novas linhas (stat barato: só lê se o arquivo cresceu)
+                try:
+                    st = os.stat(log_path)
+                    size = st.st_size
+                    # Truncado ou substituído (outro inode): conteúdo antigo não vale mais
+                    reload = reload or size < last_pos or st.st_ino != os.fstat(f.fileno()).st_ino
+                except OSError:
+                    size = last_pos
+                if reload:
+                    events = deque(load_events(log_path), maxlen=MAX_EVENTS)
+                    events_by_cycle = group_by_cycle(events)
+                    last_orders = deque((e for e in events if e.get("action") in ORDER_ACTIONS), maxlen=LAST_ORDERS)
+                    stats = compute_stats(events)
+                    f.close()
+                    f = open(log_path, "rb")
+                    last_pos = os.lseek(f.fileno(), 0, os.SEEK_END)
+                    pending = b""
+                    events_version += 1
+                elif size > last_pos:
+                    new_events, pending = _read_new_events(f.fileno(), pending)
+                    last_pos = os.lseek(f.fileno(), 0, os.SEEK_CUR)
+                    events.extend(new_events)
+                    group_by_cycle(new_events, events_by_cycle)
+                    last_orders.extend(e for e in new_events if e.get("action") in ORDER_ACTIONS)
+                    update_stats(stats, new_events)
+                    if new_events:
+                        events_version += 1
+
+                prune_cycles(events_by_cycle, (int(time.time()) // WINDOW_SECONDS + 1) * WINDOW_SECONDS)
+
+                with _live_lock:
+                    live_data = _live_data
+                # Sem eventos novos, preços iguais e mesmo ciclo: só relógio e barra mudam
+                now = int(time.time())
+                key = (events_version, live_data, now // WINDOW_SECONDS)
+                if key != frame_key:
+                    frame_lines = build_dashboard(events, live_data, events_by_cycle, last_orders, stats).split("\n")
+                    frame_key = key
+                else:
+                    frame_lines[CLOCK_LINE:CLOCK_LINE + 2] = clock_lines(now, live_data, stats)
+                out, prev_lines = render_frame("\n".join(frame_lines), prev_lines)
+                if not write_stdout(out):
+                    prev_lines = None  # frame saiu pela metade: redesenhar tudo no próximo
+                _wait_for_log_change(watch, RENDER_SECONDS)
     except KeyboardInterrupt:
         print(f"\n{C.YELLOW}Dashboard encerrado.{C.RESET}")
         sys.exit(0)
+    finally:
+        if httpx:
+            close_http_client()
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Debug completo do envio de ordem Type 1.
 Mostra cada passo do processo para identificar o problema.
 """
 
+import importlib.util
 import json
 import os
 import sys
@@ -15,11 +16,11 @@ from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+# py-clob-client: so checa se esta instalado; o import (pesado) fica no passo 5
 try:
-    from py_clob_client.client import ClobClient
-    from py_clob_client.clob_types import OrderArgs, ApiCreds
-    from py_clob_client.order_builder.constants import BUY
     from eth_account import Account
+    if importlib.util.find_spec("py_clob_client") is None:
+        raise ImportError("No module named 'py_clob_client'")
 except ImportError as e:
     print(f"ERRO: {e}")
     print("Execute: pip install py-clob-client eth-account")
@@ -28,6 +29,10 @@ except ImportError as e:
 CLOB_HOST = os.getenv("CLOB_BASE_URL", "https://clob.polymarket.com")
 GAMMA_HOST = os.getenv("GAMMA_BASE_URL", "https://gamma-api.polymarket.com")
 CHAIN_ID = 137
+DEBUG_ORDER_FIELDS = (
+    "salt", "maker", "signer", "taker", "tokenId", "makerAmount", "takerAmount",
+    "side", "expiration", "nonce", "feeRateBps", "signatureType", "signature",
+)
 
 
 def step(num, msg):
@@ -119,6 +124,10 @@ def main():
     # Step 5: Criar cliente
     step(5, "Criando ClobClient")
 
+    from py_clob_client.client import ClobClient
+    from py_clob_client.clob_types import OrderArgs, ApiCreds
+    from py_clob_client.order_builder.constants import BUY
+
     client = ClobClient(
         CLOB_HOST,
         chain_id=CHAIN_ID,
@@ -158,11 +167,12 @@ def main():
         signed_order = client.create_order(order_args)
         print("Ordem criada com sucesso!")
 
-        # Mostrar todos os atributos da ordem
-        order_dict = vars(signed_order) if hasattr(signed_order, '__dict__') else {}
-        for k, v in order_dict.items():
-            val_str = str(v)[:50] if len(str(v)) > 50 else str(v)
-            print(f"  - {k}: {val_str}")
+        # Mostrar só os campos da ordem assinada (dict() serializa order + signature)
+        order_dict = signed_order.dict() if hasattr(signed_order, "dict") else vars(signed_order)
+        for k in DEBUG_ORDER_FIELDS:
+            if k in order_dict:
+                val_str = str(order_dict[k])
+                print(f"  - {k}: {val_str[:50] + '...' if len(val_str) > 50 else val_str}")
 
     except Exception as e:
         print(f"ERRO ao criar ordem: {e}")
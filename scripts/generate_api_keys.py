@@ -8,51 +8,189 @@ SEGURANCA:
 - Private key NUNCA sai da maquina
 - Nenhum servidor terceiro envolvido
 - NAO usa py-clob-client ou polymarket-apis
+- Cache local das credenciais derivadas SO com --cached (~/.cache/bookpoly/creds,
+  modo 0600, 30 dias); criar nova key (opcao 2) invalida o cache
 
 DEPENDENCIAS:
     pip install eth-account httpx python-dotenv
 
 USO:
     python scripts/generate_api_keys.py
+    python scripts/generate_api_keys.py --cached   # opcao 1 reaproveita/salva o cache local
 """
 
+import argparse
+import atexit
+import hashlib
+import json
 import os
+import random
 import sys
 import time
 import httpx
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
 try:
     from eth_account import Account
+    from eth_account.messages import SignableMessage, encode_typed_data
+    from eth_utils import keccak
 except ImportError:
     print("ERRO: eth-account nao instalado")
     print("Execute: pip install eth-account")
     sys.exit(1)
 
+# HTTP/2 (extra httpx[http2]) quando disponivel: /time e /auth/* na mesma conexao
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# orjson (opcional): parse direto dos bytes da resposta; senao json da stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 # Configuracoes
 CLOB_HOST = "https://clob.polymarket.com"
+ENV_PATH = Path(__file__).parent.parent / ".env"
+# Cache local das credenciais derivadas (derive e deterministico por carteira + nonce)
+CREDS_CACHE_DIR = Path.home() / ".cache" / "bookpoly" / "creds"
+CREDS_CACHE_MAX_AGE = 30 * 86400  # segundos
 CHAIN_ID = 137  # Polygon
+TIME_RETRIES = 3  # tentativas do /time (falha cai no relogio local -> 401 por relogio desincronizado)
 L1_MESSAGE = "This message attests that I control the given wallet"
 
+# EIP-712 da L1 auth: dominio e tipos sao fixos, so a mensagem varia (timestamp/nonce)
+CLOB_AUTH_DOMAIN = {
+    "name": "ClobAuthDomain",
+    "version": "1",
+    "chainId": CHAIN_ID,
+}
+CLOB_AUTH_TYPES = {
+    "ClobAuth": [
+        {"name": "address", "type": "address"},
+        {"name": "timestamp", "type": "string"},
+        {"name": "nonce", "type": "uint256"},
+        {"name": "message", "type": "string"},
+    ],
+}
+# Pre-calculados no import: separador do dominio e hashes constantes do struct ClobAuth.
+# Por assinatura so resta hashear o struct (address, timestamp, nonce) - ver _clob_auth_hash.
+_DOMAIN_SEPARATOR = encode_typed_data(
+    CLOB_AUTH_DOMAIN, CLOB_AUTH_TYPES,
+    {"address": "0x" + "00" * 20, "timestamp": "0", "nonce": 0, "message": L1_MESSAGE},
+).header
+_CLOB_AUTH_TYPEHASH = keccak(text="ClobAuth(address address,string timestamp,uint256 nonce,string message)")
+_L1_MESSAGE_HASH = keccak(text=L1_MESSAGE)
+
+_client: httpx.Client | None = None
+_time_offset: int | None = None  # relogio do servidor CLOB - relogio local (segundos)
+
+
+def http_client() -> httpx.Client:
+    """Client unico para /time e /auth/*: uma so conexao TLS para o script inteiro."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            base_url=CLOB_HOST,
+            timeout=30,
+            http2=HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=1),
+        )
+    return _client
+
+
+def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+atexit.register(close_http_client)  # tambem quando usado como modulo, sem main()
+
+
+@lru_cache(maxsize=4)
+def _env_values(path: str, mtime_ns: int) -> dict:
+    """Conteudo do .env, parseado uma vez por versao do arquivo (path, mtime)."""
+    return dotenv_values(path)
+
+
+def load_env(env_path: Path) -> None:
+    """Como load_dotenv (nao sobrescreve variaveis ja definidas), mas sem reler o .env inalterado."""
+    try:
+        mtime_ns = env_path.stat().st_mtime_ns
+    except OSError:
+        return
+    for key, value in _env_values(str(env_path), mtime_ns).items():
+        if value is not None:
+            os.environ.setdefault(key, value)
+
+
+@lru_cache(maxsize=8)
+def _account(private_key: str | bytes):
+    """Account da private key (derivar a chave publica/endereco e caro: uma vez por key)."""
+    return Account.from_key(private_key)
+
+
+def forget_private_key() -> None:
+    """Descarta as referencias a private key guardadas pelo modulo (caches e os.environ).
+
+    Chamar logo apos a ultima assinatura, junto com del das copias locais do chamador
+    (a key e o LocalAccount).  bytes/str sao imutaveis e nao da para zerar; isto so
+    encerra a vida das copias conhecidas para que o GC possa libera-las.
+    """
+    _account.cache_clear()
+    _env_values.cache_clear()
+    os.environ.pop("POLYMARKET_PRIVATE_KEY", None)
+
+
+def _clob_auth_hash(address: str, timestamp: str, nonce: int) -> bytes:
+    """hashStruct(ClobAuth) do EIP-712, especializado para o schema fixo de CLOB_AUTH_TYPES."""
+    return keccak(
+        _CLOB_AUTH_TYPEHASH
+        + bytes.fromhex(address[2:]).rjust(32, b"\0")
+        + keccak(text=timestamp)
+        + nonce.to_bytes(32, "big")
+        + _L1_MESSAGE_HASH
+    )
 
-def get_server_timestamp() -> int:
-    """Obtem timestamp do servidor CLOB (recomendado pela doc para L1 auth)."""
-    with httpx.Client(timeout=10) as client:
-        resp = client.get(f"{CLOB_HOST}/time")
-        resp.raise_for_status()
-        return int(float(resp.text.strip()))
 
+def get_server_timestamp() -> int:
+    """Obtem timestamp do servidor CLOB (recomendado pela doc para L1 auth).
 
-def create_l1_auth_headers(private_key: str, nonce: int = 0, timestamp: int | None = None) -> dict:
+    /time e consultado so na primeira vez; depois usa o relogio local + offset guardado.
+    """
+    global _time_offset
+    if _time_offset is None:
+        for attempt in range(TIME_RETRIES):
+            try:
+                resp = http_client().get("/time", timeout=10)
+                resp.raise_for_status()
+                break
+            except httpx.HTTPError:
+                if attempt == TIME_RETRIES - 1:
+                    raise
+                # Backoff exponencial com jitter (50ms, 100ms, ...), na mesma conexao
+                time.sleep(0.05 * 2 ** attempt * random.uniform(0.5, 1.5))
+        _time_offset = int(float(resp.text.strip())) - int(time.time())
+    return int(time.time()) + _time_offset
+
+
+def create_l1_auth_headers(private_key: str | bytes, nonce: int = 0, timestamp: int | None = None) -> dict:
     """
     Cria headers de autenticacao L1 usando EIP-712.
 
     A assinatura e feita LOCALMENTE - a private key nunca sai da maquina.
     Usa timestamp do servidor CLOB quando disponivel (evita 401 por relogio desincronizado).
     """
-    account = Account.from_key(private_key)
+    account = _account(private_key)
     address = account.address
     if timestamp is None:
         try:
@@ -60,33 +198,9 @@ def create_l1_auth_headers(private_key: str, nonce: int = 0, timestamp: int | No
         except Exception:
             timestamp = int(time.time())
 
-    domain_data = {
-        "name": "ClobAuthDomain",
-        "version": "1",
-        "chainId": CHAIN_ID,
-    }
-    message_types = {
-        "ClobAuth": [
-            {"name": "address", "type": "address"},
-            {"name": "timestamp", "type": "string"},
-            {"name": "nonce", "type": "uint256"},
-            {"name": "message", "type": "string"},
-        ],
-    }
-    message_data = {
-        "address": address,
-        "timestamp": str(timestamp),
-        "nonce": nonce,
-        "message": L1_MESSAGE,
-    }
-
-    # Assinar com sign_typed_data (EIP-712) - formato esperado pela API
-    signed = Account.sign_typed_data(
-        private_key,
-        domain_data,
-        message_types,
-        message_data,
-    )
+    # Assinar EIP-712 (mesmo resultado de sign_typed_data com CLOB_AUTH_DOMAIN/TYPES)
+    signable = SignableMessage(b"\x01", _DOMAIN_SEPARATOR, _clob_auth_hash(address, str(timestamp), nonce))
+    signed = account.sign_message(signable)
     sig_hex = signed.signature.hex()
     signature = sig_hex if sig_hex.startswith("0x") else "0x" + sig_hex
 
@@ -98,7 +212,48 @@ def create_l1_auth_headers(private_key: str, nonce: int = 0, timestamp: int | No
     }
 
 
-def derive_api_key(private_key: str, nonce: int = 0) -> dict:
+def _creds_cache_path(address: str, nonce: int) -> Path:
+    return CREDS_CACHE_DIR / hashlib.sha256(f"{address.lower()}:{nonce}".encode()).hexdigest()[:16]
+
+
+def clear_cached_creds(address: str, nonce: int = 0) -> None:
+    try:
+        _creds_cache_path(address, nonce).unlink()
+    except OSError:
+        pass
+
+
+def load_cached_creds(address: str, nonce: int = 0) -> dict | None:
+    """Credenciais derivadas salvas ha menos de CREDS_CACHE_MAX_AGE, senao None."""
+    path = _creds_cache_path(address, nonce)
+    try:
+        if time.time() - path.stat().st_mtime > CREDS_CACHE_MAX_AGE:
+            return None
+        return _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_creds(address: str, nonce: int, creds: dict) -> None:
+    """Grava as credenciais com modo 0600 (criado ja restrito) e troca atomica do arquivo."""
+    path = _creds_cache_path(address, nonce)
+    tmp = path.with_suffix(".tmp")
+    try:
+        CREDS_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # tmp velho (execucao interrompida) pode ter outro modo: apagar e criar com O_EXCL
+        try:
+            tmp.unlink()
+        except FileNotFoundError:
+            pass
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(creds, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache e so otimizacao
+
+
+def derive_api_key(private_key: str | bytes, nonce: int = 0) -> dict:
     """
     Deriva API key do Polymarket CLOB.
 
@@ -108,121 +263,153 @@ def derive_api_key(private_key: str, nonce: int = 0) -> dict:
     headers = create_l1_auth_headers(private_key, nonce)
     headers["Content-Type"] = "application/json"
 
-    with httpx.Client(timeout=30) as client:
-        response = client.get(
-            f"{CLOB_HOST}/auth/derive-api-key",
-            headers=headers,
-        )
+    response = http_client().get("/auth/derive-api-key", headers=headers)
 
-        if response.status_code != 200:
-            raise Exception(f"Erro ao derivar API key: {response.status_code} - {response.text}")
+    if response.status_code != 200:
+        raise Exception(f"Erro ao derivar API key: {response.status_code} - {response.text}")
 
-        return response.json()
+    return _loads(response.content)
 
 
-def create_api_key(private_key: str, nonce: int = 0) -> dict:
+def create_api_key(private_key: str | bytes, nonce: int = 0) -> dict:
     """
     Cria uma nova API key no Polymarket CLOB.
 
-    Diferente de derive, cria uma nova key a cada chamada.
+    Diferente de derive, cria uma nova key a cada chamada (o cache local de
+    credenciais derivadas desta carteira deixa de valer e e apagado).
     """
     headers = create_l1_auth_headers(private_key, nonce)
     headers["Content-Type"] = "application/json"
 
-    with httpx.Client(timeout=30) as client:
-        response = client.post(
-            f"{CLOB_HOST}/auth/api-key",
-            headers=headers,
-        )
-
-        if response.status_code != 200:
-            raise Exception(f"Erro ao criar API key: {response.status_code} - {response.text}")
-
-        return response.json()
+    response = http_client().post("/auth/api-key", headers=headers)
+
+    if response.status_code != 200:
+        raise Exception(f"Erro ao criar API key: {response.status_code} - {response.text}")
+
+    clear_cached_creds(headers["POLY_ADDRESS"], nonce)
+    return _loads(response.content)
+
+
+# Blocos de texto do main(): cada um sai num unico write
+SEPARATOR = "=" * 60
+BANNER = "\n".join([
+    SEPARATOR,
+    "GERADOR SEGURO DE API KEYS - POLYMARKET CLOB",
+    SEPARATOR,
+    "",
+    "SEGURANCA:",
+    "  - Usa apenas eth-account (oficial)",
+    "  - Private key assinada LOCALMENTE",
+    "  - Nenhum servidor terceiro envolvido",
+    "",
+])
+MISSING_KEY_HELP = "\n".join([
+    "ERRO: POLYMARKET_PRIVATE_KEY nao encontrada no .env",
+    "",
+    "Adicione ao seu .env:",
+    "  POLYMARKET_PRIVATE_KEY=0x...",
+])
+MENU = "\n".join([
+    "Escolha uma opcao:",
+    "  1. Derivar API key (deterministica, mesma key sempre)",
+    "  2. Criar nova API key (gera nova a cada vez)",
+    "",
+])
+CREDENTIALS_TITLE = "CREDENCIAIS GERADAS COM SUCESSO!"
+CACHED_CREDENTIALS_TITLE = "\n".join([
+    "CREDENCIAIS DO CACHE LOCAL (servidor NAO consultado)",
+    "Podem estar revogadas; rode sem --cached para revalidar.",
+])
+CREDENTIALS_TEMPLATE = "\n".join([
+    SEPARATOR,
+    "{title}",
+    SEPARATOR,
+    "",
+    "Adicione ao seu .env:",
+    "",
+    "POLYMARKET_API_KEY={api_key}",
+    "POLYMARKET_API_SECRET={api_secret}",
+    "POLYMARKET_PASSPHRASE={api_passphrase}",
+    "",
+    SEPARATOR,
+    "IMPORTANTE: Guarde essas credenciais em local seguro!",
+    SEPARATOR,
+])
+ERROR_CAUSES = "\n".join([
+    "Possiveis causas:",
+    "  - Private key invalida",
+    "  - Carteira nao registrada no Polymarket",
+    "  - Problema de conexao com API",
+])
 
 
 def main():
-    print("=" * 60)
-    print("GERADOR SEGURO DE API KEYS - POLYMARKET CLOB")
-    print("=" * 60)
-    print()
-    print("SEGURANCA:")
-    print("  - Usa apenas eth-account (oficial)")
-    print("  - Private key assinada LOCALMENTE")
-    print("  - Nenhum servidor terceiro envolvido")
-    print()
+    parser = argparse.ArgumentParser(description="Gerador de API keys do Polymarket CLOB")
+    parser.add_argument("--cached", action="store_true",
+                        help="Opcao 1: usar/salvar o cache local das credenciais derivadas.")
+    args = parser.parse_args()
+
+    print(BANNER)
 
     # Carregar .env
-    env_path = Path(__file__).parent.parent / ".env"
-    load_dotenv(env_path)
+    load_env(ENV_PATH)
 
     private_key = os.getenv("POLYMARKET_PRIVATE_KEY")
 
     if not private_key:
-        print("ERRO: POLYMARKET_PRIVATE_KEY nao encontrada no .env")
-        print()
-        print("Adicione ao seu .env:")
-        print("  POLYMARKET_PRIVATE_KEY=0x...")
+        print(MISSING_KEY_HELP)
         sys.exit(1)
 
-    # Validar formato
-    if not private_key.startswith("0x"):
-        private_key = f"0x{private_key}"
-
+    # Validar formato: 32 bytes em hex (com ou sem 0x), decodificados uma unica vez
     try:
-        account = Account.from_key(private_key)
-        print(f"Carteira: {account.address}")
-        print()
+        private_key = bytes.fromhex(private_key.removeprefix("0x"))
+        if len(private_key) != 32:
+            raise ValueError(f"esperado 32 bytes, recebido {len(private_key)}")
+        account = _account(private_key)
+        print(f"Carteira: {account.address}\n")
     except Exception as e:
         print(f"ERRO: Private key invalida - {e}")
         sys.exit(1)
 
-    print("Escolha uma opcao:")
-    print("  1. Derivar API key (deterministica, mesma key sempre)")
-    print("  2. Criar nova API key (gera nova a cada vez)")
-    print()
+    print(MENU)
 
     choice = input("Opcao [1/2]: ").strip()
 
-    if choice not in ["1", "2"]:
+    if choice not in {"1", "2"}:
         choice = "1"
 
-    print()
-    print("Gerando credenciais...")
-    print()
+    print("\nGerando credenciais...\n")
 
     try:
+        from_cache = False
         if choice == "1":
-            creds = derive_api_key(private_key)
+            creds = load_cached_creds(account.address) if args.cached else None
+            from_cache = creds is not None
+            if creds is None:
+                creds = derive_api_key(private_key)
+                if args.cached:
+                    save_cached_creds(account.address, 0, creds)
         else:
             creds = create_api_key(private_key)
 
+        # Ultima assinatura ja feita: soltar as referencias a key antes de imprimir
+        del private_key, account
+        forget_private_key()
+
         api_key = creds.get("apiKey", creds.get("api_key", ""))
         api_secret = creds.get("secret", creds.get("api_secret", ""))
         api_passphrase = creds.get("passphrase", creds.get("api_passphrase", ""))
 
-        print("=" * 60)
-        print("CREDENCIAIS GERADAS COM SUCESSO!")
-        print("=" * 60)
-        print()
-        print("Adicione ao seu .env:")
-        print()
-        print(f"POLYMARKET_API_KEY={api_key}")
-        print(f"POLYMARKET_API_SECRET={api_secret}")
-        print(f"POLYMARKET_PASSPHRASE={api_passphrase}")
-        print()
-        print("=" * 60)
-        print("IMPORTANTE: Guarde essas credenciais em local seguro!")
-        print("=" * 60)
+        print(CREDENTIALS_TEMPLATE.format(
+            title=CACHED_CREDENTIALS_TITLE if from_cache else CREDENTIALS_TITLE,
+            api_key=api_key, api_secret=api_secret, api_passphrase=api_passphrase,
+        ))
 
     except Exception as e:
-        print(f"ERRO: {e}")
-        print()
-        print("Possiveis causas:")
-        print("  - Private key invalida")
-        print("  - Carteira nao registrada no Polymarket")
-        print("  - Problema de conexao com API")
+        print(f"ERRO: {e}\n\n{ERROR_CAUSES}")
         sys.exit(1)
+    finally:
+        close_http_client()
 
 
 if __name__ == "__main__":
@@ -24,9 +24,12 @@ from __future__ import annotations
 
 import os
 import sys
+from array import array
+from bisect import bisect_left
 from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 # Reuso de normalizacao do scorer existente
@@ -48,6 +51,52 @@ except ImportError:
 #  Config (thresholds dinamicos via .env)
 # ──────────────────────────────────────────────
 
+@lru_cache(maxsize=1)
+def _env_config() -> dict[str, float | int | bool]:
+    """Variaveis GR_* convertidas, lidas uma unica vez.
+
+    Lido no primeiro GuardrailConfig() e nao no import: bots que importam
+    guardrails antes do load_dotenv ainda enxergam os GR_* do .env.
+    """
+    env = os.getenv
+    return {
+        "pump_window_s":          int(env("GR_PUMP_WINDOW_S", "60")),
+        "pump_sigma":             float(env("GR_PUMP_SIGMA", "2.0")),
+        "pump_threshold_min":     float(env("GR_PUMP_THRESHOLD_MIN", "0.03")),
+        "pump_threshold_max":     float(env("GR_PUMP_THRESHOLD_MAX", "0.25")),
+        "pump_weight":            float(env("GR_PUMP_WEIGHT", "0.30")),
+
+        "stability_window_s":     int(env("GR_STABILITY_WINDOW_S", "30")),
+        "stability_spike_factor": float(env("GR_STABILITY_SPIKE_FACTOR", "2.5")),
+        "stability_weight":       float(env("GR_STABILITY_WEIGHT", "0.25")),
+
+        "band_min":               float(env("GR_BAND_MIN", "0.93")),
+        "band_max":               float(env("GR_BAND_MAX", "0.98")),
+        "time_in_band_full_s":    float(env("GR_TIME_IN_BAND_FULL_S", "40")),
+        "time_in_band_weight":    float(env("GR_TIME_IN_BAND_WEIGHT", "0.30")),
+
+        "momentum_window_s":      int(env("GR_MOMENTUM_WINDOW_S", "30")),
+        "momentum_sigma":         float(env("GR_MOMENTUM_SIGMA", "2.0")),
+        "momentum_threshold_min": float(env("GR_MOMENTUM_THRESHOLD_MIN", "0.02")),
+        "momentum_threshold_max": float(env("GR_MOMENTUM_THRESHOLD_MAX", "0.15")),
+        "momentum_weight":        float(env("GR_MOMENTUM_WEIGHT", "0.15")),
+
+        "block_threshold":        float(env("GR_BLOCK_THRESHOLD", "0.60")),
+        "caution_threshold":      float(env("GR_CAUTION_THRESHOLD", "0.40")),
+
+        "reset_preserve_s":       int(env("GR_RESET_PRESERVE_S", "60")),
+
+        "min_samples":            int(env("GR_MIN_SAMPLES", "3")),
+        "min_samples_window_s":   int(env("GR_MIN_SAMPLES_WINDOW_S", "10")),
+
+        "enabled":                env("GR_ENABLED", "true").lower() == "true",
+    }
+
+
+def _env_field(name: str):
+    return field(default_factory=lambda: _env_config()[name])
+
+
 @dataclass
 class GuardrailConfig:
     """Configuracao do Guardrails PRO.  Segue padrao de DefenseConfig (defense.py).
@@ -58,46 +107,46 @@ class GuardrailConfig:
     """
 
     # Signal 1: Rapid Pump — threshold dinamico (sigma-based)
-    pump_window_s: int        = int(os.getenv("GR_PUMP_WINDOW_S", "60"))
-    pump_sigma: float         = float(os.getenv("GR_PUMP_SIGMA", "2.0"))
-    pump_threshold_min: float = float(os.getenv("GR_PUMP_THRESHOLD_MIN", "0.03"))
-    pump_threshold_max: float = float(os.getenv("GR_PUMP_THRESHOLD_MAX", "0.25"))
-    pump_weight: float        = float(os.getenv("GR_PUMP_WEIGHT", "0.30"))
+    pump_window_s: int        = _env_field("pump_window_s")
+    pump_sigma: float         = _env_field("pump_sigma")
+    pump_threshold_min: float = _env_field("pump_threshold_min")
+    pump_threshold_max: float = _env_field("pump_threshold_max")
+    pump_weight: float        = _env_field("pump_weight")
 
     # Signal 2: Stability — whipsaw dinamico (spike vs baseline)
-    stability_window_s: int       = int(os.getenv("GR_STABILITY_WINDOW_S", "30"))
-    stability_spike_factor: float = float(os.getenv("GR_STABILITY_SPIKE_FACTOR", "2.5"))
-    stability_weight: float       = float(os.getenv("GR_STABILITY_WEIGHT", "0.25"))
+    stability_window_s: int       = _env_field("stability_window_s")
+    stability_spike_factor: float = _env_field("stability_spike_factor")
+    stability_weight: float       = _env_field("stability_weight")
 
     # Signal 3: Time-in-band
-    band_min: float            = float(os.getenv("GR_BAND_MIN", "0.93"))
-    band_max: float            = float(os.getenv("GR_BAND_MAX", "0.98"))
-    time_in_band_full_s: float = float(os.getenv("GR_TIME_IN_BAND_FULL_S", "40"))
-    time_in_band_weight: float = float(os.getenv("GR_TIME_IN_BAND_WEIGHT", "0.30"))
+    band_min: float            = _env_field("band_min")
+    band_max: float            = _env_field("band_max")
+    time_in_band_full_s: float = _env_field("time_in_band_full_s")
+    time_in_band_weight: float = _env_field("time_in_band_weight")
 
     # Signal 4: Momentum Direction — threshold dinamico (sigma-based)
-    momentum_window_s: int        = int(os.getenv("GR_MOMENTUM_WINDOW_S", "30"))
-    momentum_sigma: float         = float(os.getenv("GR_MOMENTUM_SIGMA", "2.0"))
-    momentum_threshold_min: float = float(os.getenv("GR_MOMENTUM_THRESHOLD_MIN", "0.02"))
-    momentum_threshold_max: float = float(os.getenv("GR_MOMENTUM_THRESHOLD_MAX", "0.15"))
-    momentum_weight: float        = float(os.getenv("GR_MOMENTUM_WEIGHT", "0.15"))
+    momentum_window_s: int        = _env_field("momentum_window_s")
+    momentum_sigma: float         = _env_field("momentum_sigma")
+    momentum_threshold_min: float = _env_field("momentum_threshold_min")
+    momentum_threshold_max: float = _env_field("momentum_threshold_max")
+    momentum_weight: float        = _env_field("momentum_weight")
 
     # Decisao
-    block_threshold: float   = float(os.getenv("GR_BLOCK_THRESHOLD", "0.60"))
-    caution_threshold: float = float(os.getenv("GR_CAUTION_THRESHOLD", "0.40"))
+    block_threshold: float   = _env_field("block_threshold")
+    caution_threshold: float = _env_field("caution_threshold")
 
     # Buffer de historico
     history_max_s: int = 180  # cobre toda a janela de entrada (240->60 = 180s)
 
     # Reset: quantos segundos preservar no novo ciclo
-    reset_preserve_s: int = int(os.getenv("GR_RESET_PRESERVE_S", "60"))
+    reset_preserve_s: int = _env_field("reset_preserve_s")
 
     # Dados minimos para avaliar (amostras nos ultimos N segundos)
-    min_samples: int = int(os.getenv("GR_MIN_SAMPLES", "3"))
-    min_samples_window_s: int = int(os.getenv("GR_MIN_SAMPLES_WINDOW_S", "10"))
+    min_samples: int = _env_field("min_samples")
+    min_samples_window_s: int = _env_field("min_samples_window_s")
 
     # Enable/disable
-    enabled: bool = os.getenv("GR_ENABLED", "true").lower() == "true"
+    enabled: bool = _env_field("enabled")
 
 
 # ──────────────────────────────────────────────
@@ -110,9 +159,14 @@ class GuardrailAction(Enum):
     BLOCK   = "BLOCK"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GuardrailDecision:
-    """Resultado da avaliacao.  Segue padrao de DefenseResult (defense.py)."""
+    """Resultado da avaliacao.  Segue padrao de DefenseResult (defense.py).
+
+    slots: sem __dict__ por instancia (uma por evaluate, a cada poll).
+    frozen: a mesma instancia pode ir para varios callers (cache do evaluate e
+    _INSUFFICIENT_DATA), entao ninguem pode altera-la.
+    """
     action: GuardrailAction
     risk_score: float           # 0.0 -> 1.0
     pump_score: float           # 0.0 -> 1.0
@@ -125,59 +179,186 @@ class GuardrailDecision:
     momentum_threshold: float = 0.0   # threshold dinamico calculado para momentum
 
 
+# Resultado fixo (nao depende do mercado): uma instancia compartilhada (imutavel).
+_INSUFFICIENT_DATA = GuardrailDecision(
+    action=GuardrailAction.BLOCK,
+    risk_score=1.0,
+    pump_score=0.0, stability_score=0.0,
+    time_in_band_score=1.0, momentum_score=0.0,
+    time_in_band_s=0.0,
+    reason="BLOCK:insufficient_data",
+)
+
+
 # ──────────────────────────────────────────────
 #  Price History (sliding window)
 # ──────────────────────────────────────────────
 
 class PriceHistory:
-    """Deque de (ts, price) com prune automatico por idade.
-    Segue padrao de DefenseState.imbalance_history."""
+    """Historico (ts, price) com prune automatico por idade.
+    Segue padrao de DefenseState.imbalance_history.
 
-    __slots__ = ("_data", "_max_age_s")
+    Guardado como colunas paralelas (structure of arrays) em array.array, sem
+    tupla nem float boxed por amostra: _ts (em ordem, para bisect), _px e
+    _turns, o total acumulado de mudancas de direcao ate cada ponto (contar
+    whipsaw numa janela vira uma subtracao).  As amostras vivas sao
+    [_head:]; o prune so avanca _head e compacta quando metade esta morta.
+
+    _mins / _maxs sao deques monotonicos de (ts, price): so os pontos que
+    ainda podem ser minimo (maximo) de alguma janela terminando agora.
+
+    Bisect e deques monotonicos exigem ts nao-decrescente entre appends
+    (GuardrailsPro.update garante isso).
+    """
+
+    __slots__ = ("_ts", "_px", "_turns", "_head", "_mins", "_maxs", "_max_age_s")
 
     def __init__(self, max_age_s: int = 180):
-        self._data: deque[tuple[float, float]] = deque()
+        self._ts = array("d")
+        self._px = array("d")
+        self._turns = array("q")
+        self._head = 0
+        self._mins: deque[tuple[float, float]] = deque()
+        self._maxs: deque[tuple[float, float]] = deque()
         self._max_age_s = max_age_s
 
+    def __len__(self) -> int:
+        return len(self._ts) - self._head
+
     def append(self, ts: float, price: float) -> None:
-        self._data.append((ts, price))
+        px = self._px
+        turns = self._turns[-1] if self._turns else 0
+        if len(self) >= 2:
+            p_prev = px[-1]
+            if (p_prev - px[-2]) * (price - p_prev) < 0:  # mudou de direcao
+                turns += 1
+        self._ts.append(ts)
+        px.append(price)
+        self._turns.append(turns)
+
+        mins, maxs = self._mins, self._maxs
+        while mins and mins[-1][1] >= price:
+            mins.pop()
+        mins.append((ts, price))
+        while maxs and maxs[-1][1] <= price:
+            maxs.pop()
+        maxs.append((ts, price))
+
         self._prune(ts)
 
     def _prune(self, now: float) -> None:
-        cutoff = now - self._max_age_s
-        while self._data and self._data[0][0] < cutoff:
-            self._data.popleft()
+        self.prune_before(now - self._max_age_s)
+
+    def prune_before(self, cutoff: float) -> None:
+        """Descarta (in-place) as amostras com ts < cutoff."""
+        stamps = self._ts
+        head = bisect_left(stamps, cutoff, self._head)
+        if head * 2 > len(stamps):
+            del stamps[:head]
+            del self._px[:head]
+            del self._turns[:head]
+            head = 0
+        self._head = head
+        while self._mins and self._mins[0][0] < cutoff:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0][0] < cutoff:
+            self._maxs.popleft()
+
+    def window(self, now: float, window_s: float) -> tuple[list[float], list[float]]:
+        """(timestamps, precos) dos ultimos window_s segundos."""
+        start = bisect_left(self._ts, now - window_s, self._head)
+        return self._ts[start:].tolist(), self._px[start:].tolist()
 
     def price_at_offset(self, now: float, offset_s: int) -> Optional[float]:
         """Preco mais proximo de (now - offset_s).  Tolerancia: 3s."""
         target = now - offset_s
-        best: Optional[float] = None
+        stamps = self._ts
+        head = self._head
+        idx = bisect_left(stamps, target, head)
+        # Candidatos: ultimo ponto antes do alvo e primeiro ponto >= alvo.
+        # Empate fica com o mais antigo (mesma regra do scan linear).
+        best_idx = -1
         best_dist = float("inf")
-        for ts, p in self._data:
-            dist = abs(ts - target)
-            if dist < best_dist:
-                best_dist = dist
-                best = p
-        return best if best_dist <= 3.0 else None
+        if idx > head:
+            best_dist = abs(stamps[idx - 1] - target)
+            best_idx = bisect_left(stamps, stamps[idx - 1], head)
+        if idx < len(stamps) and abs(stamps[idx] - target) < best_dist:
+            best_dist = abs(stamps[idx] - target)
+            best_idx = idx
+        return self._px[best_idx] if best_dist <= 3.0 else None
 
     def range_in_window(self, now: float, window_s: int) -> Optional[tuple[float, float]]:
-        """(min, max) dos precos nos ultimos window_s segundos."""
-        cutoff = now - window_s
-        prices = [p for ts, p in self._data if ts >= cutoff]
-        if not prices:
+        """(min, max) dos precos nos ultimos window_s segundos.
+
+        O minimo da janela e o primeiro de _mins com ts >= cutoff (idem _maxs).
+        """
+        key = (now - window_s,)  # (cutoff,) < (cutoff, p): acha o 1o ts >= cutoff
+        i = bisect_left(self._mins, key)
+        if i == len(self._mins):
             return None
-        return (min(prices), max(prices))
+        return (self._mins[i][1], self._maxs[bisect_left(self._maxs, key)][1])
 
     def samples_in_window(self, now: float, window_s: int) -> int:
-        cutoff = now - window_s
-        return sum(1 for ts, _ in self._data if ts >= cutoff)
+        return len(self._ts) - bisect_left(self._ts, now - window_s, self._head)
+
+    def direction_changes(self, now: float, window_s: int) -> tuple[int, int]:
+        """(mudancas de direcao, amostras) nos ultimos window_s segundos.
+
+        So contam pontos cujos dois antecessores tambem estao na janela.
+        """
+        n = self.samples_in_window(now, window_s)
+        if n < 3:
+            return 0, n
+        turns = self._turns
+        return turns[-1] - turns[-n + 1], n
 
     @property
     def latest(self) -> Optional[float]:
-        return self._data[-1][1] if self._data else None
+        return self._px[-1] if len(self) else None
+
+    @property
+    def latest_ts(self) -> Optional[float]:
+        return self._ts[-1] if len(self) else None
 
     def clear(self) -> None:
-        self._data.clear()
+        del self._ts[:]
+        del self._px[:]
+        del self._turns[:]
+        self._head = 0
+        self._mins.clear()
+        self._maxs.clear()
+
+
+def _paired_deltas(stamps: list[float], prices: list[float], window_s: int) -> list[float]:
+    """Para cada ponto i, p_i - p_j onde j e o primeiro ponto a ate 3s de (ts_i - window_s).
+
+    stamps esta em ordem, entao o alvo so avanca: um cursor j que nunca volta
+    (two-pointer) substitui a busca O(n) por ponto.  Pontos sem par sao ignorados.
+    """
+    deltas: list[float] = []
+    n = len(stamps)
+    j = 0
+    for ts_i, p_i in zip(stamps, prices):
+        target_ts = ts_i - window_s
+        while j < n and stamps[j] - target_ts < -3.0:
+            j += 1
+        if j < n and stamps[j] - target_ts <= 3.0:
+            deltas.append(p_i - prices[j])
+    return deltas
+
+
+def _sigma_threshold(samples: list[float], min_count: int, sigma: float,
+                     thr_min: float, thr_max: float) -> float:
+    """Threshold dinamico: media + sigma*std das amostras, limitado a [thr_min, thr_max].
+
+    Com menos de min_count amostras (cold start) devolve thr_min.
+    """
+    if len(samples) < min_count:
+        return thr_min
+    mean = sum(samples) / len(samples)
+    variance = sum((d - mean) ** 2 for d in samples) / len(samples)
+    threshold = mean + sigma * variance ** 0.5
+    return max(thr_min, min(thr_max, threshold))
 
 
 # ──────────────────────────────────────────────
@@ -194,11 +375,21 @@ class GuardrailsPro:
         self.no_history  = PriceHistory(max_age_s=self.config.history_max_s)
         self._yes_band_entry_ts: Optional[float] = None
         self._no_band_entry_ts: Optional[float] = None
+        # Decisoes do poll atual por (side, now); limpo a cada update/reset
+        self._cache: dict[tuple[str, float], GuardrailDecision] = {}
 
     # ── update (chamado a cada poll, 1s) ──
 
     def update(self, ts: float, yes_price: float, no_price: float) -> None:
-        """Armazena precos e rastreia entrada na faixa.  Custo: O(1)."""
+        """Armazena precos e rastreia entrada na faixa.  Custo: O(1).
+
+        ts menor que o ultimo armazenado (time.time() voltou num ajuste de NTP)
+        e tratado como o ultimo: PriceHistory exige timestamps nao-decrescentes.
+        """
+        self._cache.clear()
+        last_ts = self.yes_history.latest_ts
+        if last_ts is not None and ts < last_ts:
+            ts = last_ts
         self.yes_history.append(ts, yes_price)
         self.no_history.append(ts, no_price)
 
@@ -229,7 +420,19 @@ class GuardrailsPro:
 
         Returns:
             GuardrailDecision com action e todos os scores
+
+        Chamadas repetidas com o mesmo (side, now) entre dois updates
+        devolvem a mesma decisao sem recalcular.
         """
+        key = (candidate_side, now)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        decision = self._evaluate(candidate_side, now)
+        self._cache[key] = decision
+        return decision
+
+    def _evaluate(self, candidate_side: str, now: float) -> GuardrailDecision:
         cfg = self.config
 
         # Desabilitado -> ALLOW sempre
@@ -241,17 +444,13 @@ class GuardrailsPro:
 
         # FIX 3: Dados insuficientes -> BLOCK (nao CAUTION)
         if history.samples_in_window(now, cfg.min_samples_window_s) < cfg.min_samples:
-            return GuardrailDecision(
-                action=GuardrailAction.BLOCK,
-                risk_score=1.0,
-                pump_score=0.0, stability_score=0.0,
-                time_in_band_score=1.0, momentum_score=0.0,
-                time_in_band_s=0.0,
-                reason="BLOCK:insufficient_data",
-            )
+            return _INSUFFICIENT_DATA
+
+        # Janela de 120s (baseline de pump/momentum) materializada uma vez
+        stamps, prices = history.window(now, 120)
 
         # ── Signal 1: Rapid Pump ──
-        pump, pump_thr = self._pump(history, now)
+        pump, pump_thr = self._pump(history, now, stamps, prices)
 
         # ── Signal 2: Stability ──
         stability = self._stability(history, now)
@@ -261,7 +460,7 @@ class GuardrailsPro:
         tib = self._time_in_band(tib_s)
 
         # ── Signal 4: Momentum Direction ──
-        momentum, mom_thr = self._momentum(history, now)
+        momentum, mom_thr = self._momentum(history, now, stamps, prices)
 
         # ── Risk Score ──
         risk = (
@@ -309,16 +508,13 @@ class GuardrailsPro:
         O mercado nao reseta a cada 15min — o guardrail tambem nao deve.
         """
         preserve_s = self.config.reset_preserve_s
+        self._cache.clear()
 
-        if self.yes_history._data:
-            now = self.yes_history._data[-1][0]
+        now = self.yes_history.latest_ts
+        if now is not None:
             cutoff = now - preserve_s
-            self.yes_history._data = deque(
-                (ts, p) for ts, p in self.yes_history._data if ts >= cutoff
-            )
-            self.no_history._data = deque(
-                (ts, p) for ts, p in self.no_history._data if ts >= cutoff
-            )
+            self.yes_history.prune_before(cutoff)
+            self.no_history.prune_before(cutoff)
         # else: historico vazio, nada a preservar
 
         # Band entry: preservar se ainda valido
@@ -328,11 +524,13 @@ class GuardrailsPro:
     #  Sinais privados (thresholds dinamicos)
     # ──────────────────────────────────────
 
-    def _pump(self, h: PriceHistory, now: float) -> tuple[float, float]:
+    def _pump(self, h: PriceHistory, now: float,
+              stamps: list[float], prices: list[float]) -> tuple[float, float]:
         """Rapid Pump: detecta movimento anormalmente rapido vs baseline recente.
 
         FIX 1: Threshold dinamico (media + K*std dos deltas recentes)
         + fator de uniformidade (desconto para movimentos graduais).
+        stamps/prices: janela de 120s ja materializada pelo evaluate.
 
         Returns: (score, dynamic_threshold)
         """
@@ -347,30 +545,19 @@ class GuardrailsPro:
 
         # --- Threshold dinamico ---
         # Calcular baseline de deltas rolling (ultimos 120s, cada ponto vs pump_window_s atras)
-        prices = [(ts, p) for ts, p in h._data if ts >= now - 120]
-        deltas: list[float] = []
-        for i, (ts_i, p_i) in enumerate(prices):
-            target_ts = ts_i - cfg.pump_window_s
-            for ts_j, p_j in prices:
-                if abs(ts_j - target_ts) <= 3.0:
-                    deltas.append(abs(p_i - p_j))
-                    break
-
-        if len(deltas) >= 5:
-            mean_delta = sum(deltas) / len(deltas)
-            variance = sum((d - mean_delta) ** 2 for d in deltas) / len(deltas)
-            std_delta = variance ** 0.5
-            dynamic_threshold = mean_delta + cfg.pump_sigma * std_delta
-            dynamic_threshold = max(cfg.pump_threshold_min,
-                                   min(cfg.pump_threshold_max, dynamic_threshold))
-        else:
-            # Cold start: usar floor conservador
-            dynamic_threshold = cfg.pump_threshold_min
+        deltas = [abs(d) for d in _paired_deltas(stamps, prices, cfg.pump_window_s)]
+
+        # Cold start (< 5 deltas): usar floor conservador
+        dynamic_threshold = _sigma_threshold(deltas, 5, cfg.pump_sigma,
+                                             cfg.pump_threshold_min, cfg.pump_threshold_max)
 
         # --- Uniformidade ---
         # Movimento gradual (std baixo) → desconto de 50%
         # Movimento erratico (std alto) → sem desconto
-        window_prices = [p for ts, p in h._data if ts >= now - cfg.pump_window_s]
+        if cfg.pump_window_s <= 120:
+            window_prices = prices[bisect_left(stamps, now - cfg.pump_window_s):]
+        else:
+            _, window_prices = h.window(now, cfg.pump_window_s)
         uniformity_factor = 1.0
         if len(window_prices) >= 5:
             returns = [window_prices[i] - window_prices[i - 1]
@@ -395,20 +582,11 @@ class GuardrailsPro:
         Score final = max(absoluto, relativo) — o pior caso prevalece.
         """
         cfg = self.config
-        cutoff = now - cfg.stability_window_s
-        prices = [p for ts, p in h._data if ts >= cutoff]
-        if len(prices) < 5:
+        direction_changes, n = h.direction_changes(now, cfg.stability_window_s)
+        if n < 5:
             return 0.0
 
-        # Contar mudancas de direcao na janela curta
-        direction_changes = 0
-        for i in range(2, len(prices)):
-            d_prev = prices[i - 1] - prices[i - 2]
-            d_curr = prices[i] - prices[i - 1]
-            if d_prev * d_curr < 0:  # mudou de direcao
-                direction_changes += 1
-
-        current_rate = direction_changes / max(1, len(prices) - 2)
+        current_rate = direction_changes / max(1, n - 2)
 
         # --- Componente 1: Absoluto ---
         # Taxa de whipsaw alta por si so = instavel
@@ -418,17 +596,9 @@ class GuardrailsPro:
 
         # --- Componente 2: Relativo (spike vs baseline) ---
         relative_score = 0.0
-        long_cutoff = now - 120
-        long_prices = [p for ts, p in h._data if ts >= long_cutoff]
-        if len(long_prices) >= 10:
-            long_changes = 0
-            for i in range(2, len(long_prices)):
-                d_prev = long_prices[i - 1] - long_prices[i - 2]
-                d_curr = long_prices[i] - long_prices[i - 1]
-                if d_prev * d_curr < 0:
-                    long_changes += 1
-
-            baseline_rate = long_changes / max(1, len(long_prices) - 2)
+        long_changes, long_n = h.direction_changes(now, 120)
+        if long_n >= 10:
+            baseline_rate = long_changes / max(1, long_n - 2)
             if baseline_rate < 0.01:
                 baseline_rate = 0.01
             spike_threshold = baseline_rate * cfg.stability_spike_factor
@@ -445,10 +615,12 @@ class GuardrailsPro:
             return 0.0
         return max(0.0, 1.0 - seconds_in_band / full)
 
-    def _momentum(self, h: PriceHistory, now: float) -> tuple[float, float]:
+    def _momentum(self, h: PriceHistory, now: float,
+                  stamps: list[float], prices: list[float]) -> tuple[float, float]:
         """Momentum: preco caindo no lado candidato = risco.
 
         Threshold dinamico: media + K*std dos deltas negativos recentes.
+        stamps/prices: janela de 120s ja materializada pelo evaluate.
 
         Returns: (score, dynamic_threshold)
         """
@@ -464,26 +636,12 @@ class GuardrailsPro:
         abs_delta = abs(delta)
 
         # --- Threshold dinamico ---
-        prices = [(ts, p) for ts, p in h._data if ts >= now - 120]
-        neg_deltas: list[float] = []
-        for i, (ts_i, p_i) in enumerate(prices):
-            target_ts = ts_i - cfg.momentum_window_s
-            for ts_j, p_j in prices:
-                if abs(ts_j - target_ts) <= 3.0:
-                    d = p_i - p_j
-                    if d < 0:
-                        neg_deltas.append(abs(d))
-                    break
-
-        if len(neg_deltas) >= 3:
-            mean_nd = sum(neg_deltas) / len(neg_deltas)
-            variance = sum((d - mean_nd) ** 2 for d in neg_deltas) / len(neg_deltas)
-            std_nd = variance ** 0.5
-            dynamic_threshold = mean_nd + cfg.momentum_sigma * std_nd
-            dynamic_threshold = max(cfg.momentum_threshold_min,
-                                   min(cfg.momentum_threshold_max, dynamic_threshold))
-        else:
-            dynamic_threshold = cfg.momentum_threshold_min
+        neg_deltas = [-d for d in _paired_deltas(stamps, prices, cfg.momentum_window_s)
+                      if d < 0]
+
+        dynamic_threshold = _sigma_threshold(neg_deltas, 3, cfg.momentum_sigma,
+                                             cfg.momentum_threshold_min,
+                                             cfg.momentum_threshold_max)
 
         score = normalize(abs_delta, 0.0, dynamic_threshold)
         return score, round(dynamic_threshold, 4)
@@ -0,0 +1,222 @@
+"""
+Tests for the bot_15min dashboard.
+
+Tests the incremental stats, the log tail/reader and the line-diff renderer.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import dashboard_bot15min as dash
+
+
+def _day_events(seed: int = 3, cycles: int = 12) -> list[dict]:
+    """Eventos de um dia sintetico, ja normalizados como na leitura do log."""
+    rnd = random.Random(seed)
+    events = []
+    ts = 1_700_000_000
+    for c in range(cycles):
+        cycle_end = 1_700_000_900 + c * 900
+        for market in ("BTC", "eth", "Sol", "xrp"):
+            events.append({"ts": ts, "action": "NEW_CYCLE", "market": market, "cycle_end_ts": cycle_end})
+            ts += 1
+            if rnd.random() < 0.3:
+                events.append({"ts": ts, "action": "SKIP_PRICE_OOR", "market": market, "cycle_end_ts": cycle_end})
+                continue
+            events.append({"ts": ts, "action": "PLACING_ORDER", "market": market, "cycle_end_ts": cycle_end})
+            ts += rnd.randint(1, 3)
+            placed = rnd.choice(["ORDER_PLACED", "ORDER_PLACED", "ORDER_FAILED"])
+            events.append({"ts": ts, "action": placed, "market": market, "cycle_end_ts": cycle_end})
+            if placed == "ORDER_PLACED":
+                fill = rnd.choice(["FILLED", "TIMEOUT_CANCEL"])
+                events.append({"ts": ts + 5, "action": fill, "market": market, "cycle_end_ts": cycle_end,
+                               "price": rnd.choice([0.93, 0.95, "0.96"]), "size": rnd.choice([5, 6, None])})
+                if fill == "FILLED":
+                    win = rnd.random() < 0.8
+                    events.append({"ts": ts + 400, "action": "POSITION_RESULT", "market": market,
+                                   "end_ts": cycle_end, "win": win, "pnl": 0.3 if win else -5.7,
+                                   "balance": 100 + c})
+            ts += 10
+    return [dash.normalize_event(e) for e in events]
+
+
+def test_update_stats_in_chunks_matches_compute_stats():
+    """Test that update_stats over chunks equals compute_stats over the whole day."""
+    events = _day_events()
+    expected = dash.compute_stats(events)
+
+    placing = [i for i, e in enumerate(events) if e["action"] == "PLACING_ORDER"]
+    splits = [
+        [len(events) // 2],
+        [i + 1 for i in placing],          # corta entre PLACING_ORDER e ORDER_PLACED
+        list(range(1, len(events))),       # um evento por chunk
+        sorted(random.Random(1).sample(range(1, len(events)), 10)),
+    ]
+    for cuts in splits:
+        stats = dash.new_stats()
+        start = 0
+        for cut in cuts + [len(events)]:
+            dash.update_stats(stats, events[start:cut])
+            start = cut
+        assert stats == expected
+
+    assert expected["order_latencies_ms"] == dash.compute_order_latencies_ms(events)
+    assert len(expected["order_latencies_ms"]) == len(placing)
+    assert expected["total_cycles"] == 48
+    print(f"[OK] Chunked stats: {expected['filled_count']} fills, {expected['failed_count']} failed")
+
+
+def test_read_new_events_keeps_partial_line():
+    """Test that an incomplete trailing line waits in pending until its newline arrives."""
+    first = {"ts": 1, "action": "PLACING_ORDER", "market": "BTC", "cycle_end_ts": 900}
+    second = {"ts": 2, "action": "ORDER_PLACED", "market": "BTC", "cycle_end_ts": 900}
+    line2 = json.dumps(second).encode()
+
+    with tempfile.TemporaryFile() as w:
+        w.write(json.dumps(first).encode() + b"\n" + line2[:10])
+        w.flush()
+        w.seek(0)
+        fd = w.fileno()
+
+        events, pending = dash._read_new_events(fd, b"")
+        assert [e["action"] for e in events] == ["PLACING_ORDER"]
+        assert pending == line2[:10]
+
+        w.seek(0, os.SEEK_END)
+        w.write(line2[10:])
+        w.flush()
+        w.seek(len(json.dumps(first)) + 1 + 10)
+        events, pending = dash._read_new_events(fd, pending)
+        assert events == [] and pending == line2
+
+        w.seek(0, os.SEEK_END)
+        w.write(b"\nnot json\n")
+        w.flush()
+        w.seek(-len(b"\nnot json\n"), os.SEEK_END)
+        events, pending = dash._read_new_events(fd, pending)
+        assert pending == b""
+        assert len(events) == 1
+        assert events[0]["action"] == "ORDER_PLACED"
+        assert events[0]["market"] == "btc" and events[0]["cycle"] == 900
+    print("[OK] Partial line kept in pending")
+
+
+def test_tail_lines_matches_full_read():
+    """Test that reading the log backwards in blocks returns the same last lines."""
+    lines = [json.dumps({"ts": i, "action": "NEW_CYCLE", "pad": "x" * (i % 37)}).encode() for i in range(500)]
+    with tempfile.TemporaryFile() as f:
+        f.write(b"\n".join(lines) + b"\n")
+        for max_lines in (1, 7, 100, 499, 500, 800):
+            for chunk_size in (16, 100, 4096):
+                assert dash._tail_lines(f, max_lines, chunk_size) == lines[-max_lines:]
+    print("[OK] Tail lines")
+
+
+def test_render_frame_rewrites_only_changed_lines():
+    """Test the line diff, with lines clipped to the terminal size."""
+    os.environ["COLUMNS"], os.environ["LINES"] = "20", "6"
+    try:
+        frame = "\n".join(f"{dash.C.RED}linha {i}{dash.C.RESET} " + "x" * 30 for i in range(10))
+        out, prev = dash.render_frame(frame, None)
+        assert out.startswith(dash.CLEAR_SCREEN)
+        assert len(prev) == 5
+        assert all(len(dash._ANSI_RE.sub("", line)) <= 20 for line in prev)
+
+        changed = frame.replace("linha 3", "LINHA 3")
+        out, prev = dash.render_frame(changed, prev)
+        assert not out.startswith(dash.CLEAR_SCREEN)
+        assert out.count("\033[2K") == 1 and "\033[4;1H" in out
+        assert "LINHA 3" in out
+
+        out, _ = dash.render_frame(changed, prev)
+        assert out == "\033[6;1H"  # nada mudou: só reposiciona o cursor
+    finally:
+        del os.environ["COLUMNS"], os.environ["LINES"]
+    print("[OK] Line-diff render")
+
+
+def test_parse_clob_price_zero():
+    """Test that a 0 price is a price, with or without msgspec."""
+    decoder = dash._CLOB_PRICE_DECODER
+    try:
+        for dec in (decoder, None):
+            dash._CLOB_PRICE_DECODER = dec
+            assert dash._parse_clob_price(b'{"price": "0.0"}', "price") == 0.0
+            assert dash._parse_clob_price(b'{"mid": "0"}', "mid") == 0.0
+            assert dash._parse_clob_price(b'{"value": "0.4"}', "mid") == 0.4
+            assert dash._parse_clob_price(b'{"mid": "1.5"}', "mid") is None
+    finally:
+        dash._CLOB_PRICE_DECODER = decoder
+    print("[OK] Zero price")
+
+
+def test_historical_events_are_normalized():
+    """Test that the historical loader feeds compute_stats like the live loader."""
+    log_dir = dash.LOG_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        dash.LOG_DIR = Path(tmp)
+        try:
+            raw = [{k: v for k, v in e.items() if k not in ("cycle",)} for e in _day_events(cycles=2)]
+            for e in raw:
+                e["market"] = e["market"].upper()
+            (Path(tmp) / "bot_15min_2026-01-01.jsonl").write_text(
+                "\n".join(json.dumps(e) for e in raw) + "\n[1]\nnot json\n"
+            )
+            events = dash.load_all_historical_events()
+        finally:
+            dash.LOG_DIR = log_dir
+
+    assert len(events) == len(raw)
+    assert all(e["market"].islower() for e in events)
+    stats = dash.compute_stats(events)
+    assert stats["total_cycles"] == 8
+    dash.compute_order_latencies_ms(events)
+    print("[OK] Historical events normalized")
+
+
+def run_all_tests():
+    """Run all dashboard tests."""
+    print("=" * 60)
+    print("        DASHBOARD TESTS")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_update_stats_in_chunks_matches_compute_stats,
+        test_read_new_events_keeps_partial_line,
+        test_tail_lines_matches_full_read,
+        test_render_frame_rewrites_only_changed_lines,
+        test_parse_clob_price_zero,
+        test_historical_events_are_normalized,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"[FAIL] {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"[ERROR] {test.__name__}: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    exit(0 if success else 1)
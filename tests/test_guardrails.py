@@ -0,0 +1,203 @@
+"""
+Tests for the guardrails module.
+
+Tests the entry filter decisions and the PriceHistory window queries
+(bisect / monotonic deques) against plain linear scans.
+"""
+
+import dataclasses
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from guardrails import (
+    GuardrailAction,
+    GuardrailConfig,
+    GuardrailsPro,
+    PriceHistory,
+)
+
+
+def _feed(gr, start_ts, prices):
+    """update() once per second with YES=p, NO=1-p. Returns the last ts."""
+    ts = start_ts
+    for p in prices:
+        gr.update(ts, p, 1 - p)
+        ts += 1.0
+    return ts - 1.0
+
+
+def test_insufficient_data_blocks():
+    """Test that we BLOCK when there are not enough recent samples."""
+    gr = GuardrailsPro("eth", GuardrailConfig())
+    gr.update(1000.0, 0.95, 0.05)
+
+    decision = gr.evaluate("YES", 1000.0)
+
+    assert decision.action == GuardrailAction.BLOCK
+    assert decision.reason == "BLOCK:insufficient_data"
+    print(f"[OK] Insufficient data: {decision.reason}")
+
+
+def test_steady_market_allows():
+    """Test ALLOW when the price sits flat in the band for a long time."""
+    gr = GuardrailsPro("eth", GuardrailConfig())
+    now = _feed(gr, 1000.0, [0.95] * 120)
+
+    decision = gr.evaluate("YES", now)
+
+    assert decision.action == GuardrailAction.ALLOW
+    assert decision.pump_score == 0.0
+    assert decision.time_in_band_score == 0.0
+    print(f"[OK] Steady market: risk={decision.risk_score}")
+
+
+def test_late_pump_blocks():
+    """Test BLOCK when the price just pumped into the band."""
+    gr = GuardrailsPro("eth", GuardrailConfig())
+    prices = [0.80] * 100 + [0.80 + 0.015 * i for i in range(1, 11)]
+    now = _feed(gr, 1000.0, prices)
+
+    decision = gr.evaluate("YES", now)
+
+    assert decision.action == GuardrailAction.BLOCK
+    assert decision.pump_score > 0.5
+    print(f"[OK] Late pump: {decision.reason}")
+
+
+def test_backwards_timestamp_is_clamped():
+    """Test that a clock step backwards (NTP) does not break the history order."""
+    gr = GuardrailsPro("eth", GuardrailConfig())
+    now = _feed(gr, 1000.0, [0.95] * 30)
+    gr.update(now - 20.0, 0.96, 0.04)  # time.time() voltou 20s
+
+    stamps = list(gr.yes_history._ts[gr.yes_history._head:])
+    assert stamps == sorted(stamps)
+    assert gr.yes_history.latest_ts == now
+    assert gr.yes_history.latest == 0.96
+    assert gr.evaluate("YES", now).time_in_band_s >= 0.0
+    print("[OK] Backwards timestamp clamped")
+
+
+def test_price_history_matches_linear_scan():
+    """Test window queries against linear scans over random histories."""
+    rnd = random.Random(7)
+    for _ in range(200):
+        h = PriceHistory(max_age_s=rnd.choice([20, 60, 180]))
+        data = []
+        ts = 0.0
+        for _ in range(rnd.randint(1, 300)):
+            ts += rnd.choice([0.0, 0.5, 1.0, 1.0, 2.0, 3.5, 9.0])
+            p = round(rnd.random(), rnd.choice([1, 2, 6]))
+            h.append(ts, p)
+            data = [(t, q) for t, q in data + [(ts, p)] if t >= ts - h._max_age_s]
+
+            now = ts + rnd.uniform(-5.0, 5.0)
+            w = rnd.choice([1, 5, 10, 30, 60, 120])
+
+            # price_at_offset: mais proximo de now - w, empate fica com o mais antigo
+            best, best_dist = None, float("inf")
+            for t, q in data:
+                if abs(t - (now - w)) < best_dist:
+                    best, best_dist = q, abs(t - (now - w))
+            assert h.price_at_offset(now, w) == (best if best_dist <= 3.0 else None)
+
+            in_window = [q for t, q in data if t >= now - w]
+            assert h.samples_in_window(now, w) == len(in_window)
+            expected_range = (min(in_window), max(in_window)) if in_window else None
+            assert h.range_in_window(now, w) == expected_range
+
+            flips = sum(
+                1 for i in range(2, len(in_window))
+                if (in_window[i - 1] - in_window[i - 2]) * (in_window[i] - in_window[i - 1]) < 0
+            )
+            assert h.direction_changes(now, w) == (flips if len(in_window) >= 3 else 0, len(in_window))
+    print("[OK] PriceHistory matches linear scans")
+
+
+def test_reset_preserves_recent_history():
+    """Test that reset() keeps only the last reset_preserve_s seconds."""
+    config = GuardrailConfig(reset_preserve_s=60)
+    gr = GuardrailsPro("eth", config)
+    now = _feed(gr, 1000.0, [0.95] * 150)
+
+    gr.reset()
+
+    assert len(gr.yes_history) == 61
+    assert len(gr.no_history) == 61
+    assert gr.yes_history.latest_ts == now
+    print("[OK] Reset keeps recent history")
+
+
+def test_evaluate_cache_cleared_by_update():
+    """Test that a cached decision is not reused after new prices arrive."""
+    gr = GuardrailsPro("eth", GuardrailConfig())
+    now = _feed(gr, 1000.0, [0.80] * 100)
+
+    first = gr.evaluate("YES", now + 1)
+    assert gr.evaluate("YES", now + 1) is first
+
+    _feed(gr, now + 1, [0.80 + 0.015 * i for i in range(1, 11)])
+    assert gr.evaluate("YES", now + 1) is not first
+    print("[OK] Evaluate cache invalidated by update")
+
+
+def test_decision_is_immutable():
+    """Test that shared decisions cannot be mutated by a caller."""
+    gr = GuardrailsPro("eth", GuardrailConfig())
+    decision = gr.evaluate("YES", 1000.0)
+
+    try:
+        decision.reason = "changed"
+    except dataclasses.FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("GuardrailDecision should be frozen")
+    assert gr.evaluate("NO", 1000.0).reason == "BLOCK:insufficient_data"
+    print("[OK] Decision is immutable")
+
+
+def run_all_tests():
+    """Run all guardrails tests."""
+    print("=" * 60)
+    print("        GUARDRAILS MODULE TESTS")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_insufficient_data_blocks,
+        test_steady_market_allows,
+        test_late_pump_blocks,
+        test_backwards_timestamp_is_clamped,
+        test_price_history_matches_linear_scan,
+        test_reset_preserves_recent_history,
+        test_evaluate_cache_cleared_by_update,
+        test_decision_is_immutable,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"[FAIL] {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"[ERROR] {test.__name__}: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    exit(0 if success else 1)